@@ -0,0 +1,698 @@
+# -*- coding: utf-8 -*-
+# Author: Dylan Jones
+# Date:   2026-10-18
+
+"""Benchmarks of the hot paths of fTmplt.
+
+Run the comparison benchmarks with
+
+    python benchmarks.py
+
+The regression suite measures the throughput and allocations of realistic
+workloads. Save the results of a baseline and compare later changes with it:
+
+    python benchmarks.py --suite --save baseline.json
+    python benchmarks.py --suite --baseline baseline.json --threshold 0.1
+
+The exit code is 1 if a workload regressed by more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import string
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Dict, List, Sequence, Tuple
+
+import ftmplt
+
+
+def legacy_pattern(template: str) -> re.Pattern:
+    """Compile the full RegEx pattern of a template the way fTmplt<=0.2 did.
+
+    Every field is matched by a lazy ``(\\n|.)*?`` group, regardless of its spec.
+    """
+    template = template.strip()
+    items = list(string.Formatter().parse(template))
+    if any(x is not None for x in items[-1][1:]):
+        items.append(("", None, None, None))
+    pattern_str, group_names, pos = "", set(), 0
+    for i in range(len(items) - 1):
+        text, name, spec, conv = items[i]
+        if not name:
+            group_name = f"_pos_{pos}"
+            pos += 1
+        elif name.isdigit():
+            group_name = f"_pos_{name}"
+        else:
+            group_name = name
+        if group_name in group_names:
+            group = r"((\n|.)*)"
+        else:
+            group = rf"(?P<{group_name}>(\n|.)*?)"
+        pattern_str += re.escape(text) + group
+        group_names.add(group_name)
+    pattern_str += re.escape(items[-1][0])
+    return re.compile(pattern_str + "$")
+
+
+def physics_output(num_blocks: int) -> Tuple[str, str, dict]:
+    """Return a template, a matching text and the data of a long output file."""
+    lines, data = list(), dict()
+    for i in range(num_blocks):
+        lines.append(f"Iteration {{it{i}:d}}: E = {{e{i}:.8e}} Ha, dE = {{de{i}:.2e}}")
+        lines.append(f"  occupation: {{occ{i}:.4f}}  converged: {{conv{i}}}")
+        data[f"it{i}"] = i
+        data[f"e{i}"] = -1.234567e2 / (i + 1)
+        data[f"de{i}"] = 1e-3 / (i + 1)
+        data[f"occ{i}"] = 0.5 + i / (2 * num_blocks)
+        data[f"conv{i}"] = "yes" if i % 2 else "no"
+    template = "\n".join(lines)
+    return template, template.format(**data), data
+
+
+def bench(stmt, number: int, repeat: int = 5) -> float:
+    """Return the best time per call of ``stmt`` in seconds."""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number
+
+
+def bench_patterns(sizes=(10, 50, 200), number: int = 10) -> None:
+    """Compare the legacy and spec-derived field patterns on long texts."""
+    print("Field patterns")
+    for num_blocks in sizes:
+        template, text, _ = physics_output(num_blocks)
+        old = legacy_pattern(template)
+        new = ftmplt.Template(template)._pattern
+        assert old.match(text) is not None
+        assert new.match(text) is not None
+        t_old = bench(lambda: old.match(text), number)
+        t_new = bench(lambda: new.match(text), number)
+        print(
+            f"  {len(text) / 1024:6.1f} kB {5 * num_blocks:5d} fields  "
+            f"legacy: {1e3 * t_old:8.3f} ms  typed: {1e3 * t_new:8.3f} ms  "
+            f"speedup: {t_old / t_new:5.1f}x"
+        )
+
+
+def bench_no_match(sizes=(4, 8, 12, 200), number: int = 3) -> None:
+    """Compare the engines on damaged output files that don't match the template.
+
+    The chained lazy groups of the untyped fields make the RegEx engine backtrack
+    exponentially, so it is only run for small files.
+    """
+
+    def parse(template, text):
+        try:
+            template.parse(text)
+        except ValueError:
+            pass
+
+    print("Damaged files (no match)")
+    for num_blocks in sizes:
+        template, text, _ = physics_output(num_blocks)
+        # One number of the last block is invalid
+        text = text[: text.rfind("occupation")] + "occupation: n/a  converged: no"
+        line = f"  {len(text) / 1024:6.1f} kB {5 * num_blocks:5d} fields  "
+        for engine in ("regex", "scan"):
+            if engine == "regex" and num_blocks > 16:
+                line += f"{engine}: {'-':>10}     "
+                continue
+            tmplt = ftmplt.Template(template, engine=engine)
+            t = bench(lambda: parse(tmplt, text), number)
+            line += f"{engine}: {1e3 * t:10.3f} ms  "
+        print(line.rstrip())
+
+
+def bench_engines(number: int = 2000) -> None:
+    """Compare the engines on templates the scan engine parses identically."""
+    blocks = [
+        f"[section {i}]\nname = {{name{i}}}\ncomment = {{c{i}}}" for i in range(20)
+    ]
+    workloads = [
+        ("short line", "Hello, my name is {name} and I live in {city}."),
+        ("input deck", "\n".join(blocks)),
+    ]
+    print("Engines (parse)")
+    for label, template in workloads:
+        keys = [name for _, name, _, _ in string.Formatter().parse(template) if name]
+        text = template.format(**{k: f"value of {k}" for k in keys})
+        line = f"  {label:<12}"
+        for engine in ("regex", "scan"):
+            tmplt = ftmplt.Template(template, engine=engine)
+            t = bench(lambda: tmplt.parse(text), number)
+            line += f"{engine}: {1e6 * t:8.2f} us  "
+        print(line.rstrip())
+
+
+def bench_parse_short(number: int = 20000) -> None:
+    """Per-call time of parsing short single-line strings."""
+    workloads = [
+        ("Hello, my name is {name} and I am {age:d} years old.", ("John", 42)),
+        ("{0:d} {1:d} {2:.3f} {3:e} {4}", (1, 2, 3.0, 4.0, "five")),
+        ("Hello, my name is {name} and I live in {city}.", ("John", "Berlin")),
+    ]
+    print("Parse (short strings)")
+    for template, values in workloads:
+        tmplt = ftmplt.Template(template)
+        keys = [name for _, name, _, _ in string.Formatter().parse(template) if name]
+        text = template.format(*values, **dict(zip(keys, values)))
+        t = bench(lambda: tmplt.parse(text), number)
+        print(f"  {1e6 * t:6.2f} us  {template}")
+
+
+def bench_datetime(num_lines: int = 100_000, number: int = 1) -> None:
+    """Compare parsing timestamps with ``datetime.strptime`` and a template."""
+    spec = "%Y-%m-%d %H:%M:%S.%f"
+    tmplt = ftmplt.Template("[{time:" + spec + "}] {message}")
+    start = datetime(2024, 1, 5)
+    times = [start + timedelta(milliseconds=250 * i) for i in range(num_lines)]
+    lines = [f"[{t:{spec}}] step {i}" for i, t in enumerate(times)]
+    raws = [line[1:27] for line in lines]
+    t_strptime = bench(lambda: [datetime.strptime(x, spec) for x in raws], number)
+    t_parse = bench(lambda: list(tmplt.parse_many(lines)), number)
+    print(f"Datetime parsing ({num_lines} lines)")
+    print(
+        f"  strptime: {1e3 * t_strptime:8.2f} ms  parse_many: {1e3 * t_parse:8.2f} ms  "
+        f"speedup: {t_strptime / t_parse:4.2f}x"
+    )
+
+
+def bench_parse_many(num_lines: int = 100_000, number: int = 1) -> None:
+    """Compare ``Template.parse_many`` with a loop over ``Template.parse``."""
+    template = "Hello, my name is {name} and I am {age:d} years old."
+    lines = [template.format(name=f"John{i}", age=i) for i in range(num_lines)]
+    tmplt = ftmplt.Template(template)
+    t_loop = bench(lambda: [tmplt.parse(line) for line in lines], number)
+    t_many = bench(lambda: list(tmplt.parse_many(lines)), number)
+    print(f"Batch parsing ({num_lines} lines)")
+    print(
+        f"  loop: {1e3 * t_loop:8.2f} ms  parse_many: {1e3 * t_many:8.2f} ms  "
+        f"speedup: {t_loop / t_many:4.2f}x"
+    )
+
+
+def bench_lazy(num_fields: int = 40, num_lines: int = 20_000) -> None:
+    """Compare eager and lazy parsing when only a few fields are used."""
+    template = ", ".join(f"p{i}={{p{i}:.6e}}" for i in range(num_fields))
+    template = "[{time:%Y-%m-%d %H:%M:%S}] " + template
+    tmplt = ftmplt.Template(template)
+    start = datetime(2024, 1, 5)
+    lines = [
+        tmplt.format(
+            {f"p{i}": i * j / 7 for i in range(num_fields)},
+            time=start + timedelta(seconds=j),
+        )
+        for j in range(num_lines)
+    ]
+
+    def use(lazy):
+        return [data["p3"] for data in tmplt.parse_many(lines, lazy=lazy)]
+
+    assert use(True) == use(False)
+    t_eager = bench(lambda: use(False), 1, repeat=3)
+    t_lazy = bench(lambda: use(True), 1, repeat=3)
+    print(f"Lazy parsing ({num_lines} lines, {num_fields + 1} fields, 1 used)")
+    print(
+        f"  eager: {1e3 * t_eager:8.2f} ms  lazy: {1e3 * t_lazy:8.2f} ms  "
+        f"speedup: {t_eager / t_lazy:4.2f}x"
+    )
+
+
+def bench_record_type(num_lines: int = 100_000) -> None:
+    """Compare the memory of parsed records of different record types."""
+    template = "Hello, my name is {name} and I am {age:d} years old."
+    lines = [template.format(name=f"John{i}", age=i) for i in range(num_lines)]
+    print(f"Record memory ({num_lines} lines)")
+    for record_type in ftmplt.RECORD_TYPES:
+        tmplt = ftmplt.Template(template, record_type=record_type)
+        tracemalloc.start()
+        records = list(tmplt.parse_many(lines))
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        t = bench(lambda: list(tmplt.parse_many(lines)), 1)
+        print(
+            f"  {record_type:<10}: {size / len(records):6.1f} B/record  "
+            f"{1e3 * t:8.2f} ms"
+        )
+
+
+def bench_parse_columns(num_lines: int = 200_000, number: int = 1) -> None:
+    """Compare columnar parsing with ``Template.parse_many``."""
+    template = "step {n:d}: E={e:.8e} x={x:.4f} p={p:.1%} tag {tag}"
+    tmplt = ftmplt.Template(template)
+    lines = [
+        tmplt.format(n=i, e=i * 1.5e-3, x=i / 7, p=i / 1000, tag="ab")
+        for i in range(num_lines)
+    ]
+    t_many = bench(lambda: list(tmplt.parse_many(lines)), number)
+    line = f"  parse_many: {1e3 * t_many:8.2f} ms  "
+    for as_numpy in (False, True):
+        if as_numpy and ftmplt.np is None:
+            continue
+        t = bench(lambda: tmplt.parse_columns(lines, as_numpy=as_numpy), number)
+        line += f"{'numpy' if as_numpy else 'array'}: {1e3 * t:8.2f} ms  "
+    print(f"Columnar parsing ({num_lines} lines)")
+    print(line.rstrip())
+
+
+def bench_format(number: int = 20000) -> None:
+    """Compare formatting with the compiled format plan and with ``str.format``."""
+    workloads = [
+        ("Hello, my name is {name} and I am {age:d} years old.", (), {"age": 42}),
+        ("{0:d} {1:d} {2:.3f} {3:e} {4}", (1, 2, 3.0, 4.0, "five"), {}),
+    ]
+    print("Format (short strings)")
+    for template, args, kwargs in workloads:
+        data = dict(enumerate(args), name="John", **kwargs)
+        tmplt = ftmplt.Template(template)
+        legacy = ftmplt.Template(template)
+        legacy._format_plan = None  # Split the data and call str.format
+        assert tmplt.format(data) == legacy.format(data)
+        t_plan = bench(lambda: tmplt.format(data), number)
+        t_old = bench(lambda: legacy.format(data), number)
+        print(
+            f"  str.format: {1e6 * t_old:6.2f} us  plan: {1e6 * t_plan:6.2f} us  "
+            f"speedup: {t_old / t_plan:4.2f}x  {template}"
+        )
+
+
+def bench_format_to(num_records: int = 100_000, number: int = 1) -> None:
+    """Compare ``Template.format_to`` with writing each formatted record."""
+    tmplt = ftmplt.Template("step {n:d}: x={x:.4f} y={y:.8e} tag={tag}")
+    records = [dict(n=i, x=i / 7, y=i * 1.5e-3, tag="ab") for i in range(num_records)]
+
+    def write_each(file):
+        with open(file, "w") as fh:
+            for record in records:
+                fh.write(tmplt.format(record))
+                fh.write("\n")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file = os.path.join(tmpdir, "sweep.txt")
+        t_loop = bench(lambda: write_each(file), number)
+        t_to = bench(lambda: tmplt.format_to(file, records), number)
+    print(f"Batch formatting ({num_records} records)")
+    print(
+        f"  loop: {1e3 * t_loop:8.2f} ms  format_to: {1e3 * t_to:8.2f} ms  "
+        f"speedup: {t_loop / t_to:4.2f}x"
+    )
+
+
+def bench_parse_files(num_files: int = 5000, number: int = 1) -> None:
+    """Compare ``Template.parse_files`` with a loop over ``Template.parse_file``."""
+    template, text, _ = physics_output(20)
+    tmplt = ftmplt.Template(template)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = [os.path.join(tmpdir, f"run{i}.out") for i in range(num_files)]
+        for file in files:
+            with open(file, "w") as fh:
+                fh.write(text)
+        t_loop = bench(lambda: [tmplt.parse_file(file) for file in files], number)
+        line = f"  loop: {1e3 * t_loop:8.2f} ms"
+        for executor in ("thread", "process"):
+            t = bench(lambda: list(tmplt.parse_files(files, executor=executor)), number)
+            line += f"  {executor}: {1e3 * t:8.2f} ms ({t_loop / t:4.2f}x)"
+    print(f"Parallel file parsing ({num_files} files, {os.cpu_count()} CPUs)")
+    print(line)
+
+
+def bench_template_set(num_kinds: int = 30, num_lines: int = 30_000) -> None:
+    """Compare ``TemplateSet`` with trying the templates of the line kinds in turn."""
+    templates = [
+        f"[{kind:02d}] step {{n:d}}: value={{x:.4f}} ({{tag}})"
+        for kind in range(num_kinds)
+    ]
+    tmplts = [ftmplt.Template(template) for template in templates]
+    lines = [
+        tmplts[i % num_kinds].format(n=i, x=i / 7, tag="ok") for i in range(num_lines)
+    ]
+
+    def parse_each(line):
+        for key, tmplt in enumerate(tmplts):
+            try:
+                return key, tmplt.parse(line)
+            except ValueError:
+                pass
+
+    template_set = ftmplt.TemplateSet(tmplts)
+    assert all(template_set.parse(line) == parse_each(line) for line in lines[:100])
+    t_loop = bench(lambda: [parse_each(line) for line in lines], 1, repeat=3)
+    t_set = bench(lambda: list(template_set.parse_many(lines)), 1, repeat=3)
+    print(f"Template set ({num_kinds} templates, {num_lines} lines)")
+    print(
+        f"  loop: {1e3 * t_loop:8.2f} ms  TemplateSet: {1e3 * t_set:8.2f} ms  "
+        f"speedup: {t_loop / t_set:4.2f}x"
+    )
+
+
+def bench_prefilter(num_lines: int = 100_000) -> None:
+    """Parse a mixed-content stream with and without the literal prefilter."""
+    template = "Iteration {it:d}: E = {energy:.8e} Ha, dE = {de:.2e}"
+    tmplt = ftmplt.Template(template)
+    lines = list()
+    for i in range(num_lines):
+        if i % 10 == 0:
+            lines.append(tmplt.format(it=i, energy=-1.5 / (i + 1), de=1e-3))
+        elif i % 10 == 1:
+            lines.append(f"Iteration {i}: not converged, dE too large")
+        else:
+            lines.append(f"  occupation: {i / num_lines:.4f}  converged: no")
+    plain = ftmplt.Template(template)
+    plain._prefilter = None
+
+    def parse(tmplt):
+        return list(tmplt.parse_many(lines, on_error="skip"))
+
+    assert parse(tmplt) == parse(plain)
+    tmplt.stats(reset=True)
+    t_plain = bench(lambda: parse(plain), 1, repeat=3)
+    t_pre = bench(lambda: parse(tmplt), 1, repeat=3)
+    stats = tmplt.stats()
+    print(f"Prefilter ({num_lines} lines, 10% matching)")
+    print(
+        f"  regex only: {1e3 * t_plain:8.2f} ms  prefilter: {1e3 * t_pre:8.2f} ms  "
+        f"speedup: {t_plain / t_pre:4.2f}x  {stats}"
+    )
+
+
+def bench_search_many(num_fields: int = 20, num_lines: int = 200_000) -> None:
+    """Compare ``Template.search_many`` with searching each field separately."""
+    template = "\n".join(f"param{i} = {{p{i}:.4f}}" for i in range(num_fields))
+    tmplt = ftmplt.Template(template)
+    # A long log with the parameters in the footer
+    log = "\n".join(f"step {i}: residual {1 / (i + 1):.6e}" for i in range(num_lines))
+    text = log + "\n" + tmplt.format({f"p{i}": i / 3 for i in range(num_fields)})
+    items = [f"p{i}" for i in range(num_fields)]
+    expected = {item: tmplt.search(text, item) for item in items}
+    assert tmplt.search_many(text, items) == expected
+    t_each = bench(lambda: [tmplt.search(text, item) for item in items], 1, repeat=3)
+    t_many = bench(lambda: tmplt.search_many(text, items), 1, repeat=3)
+    print(f"Search ({num_fields} fields, {len(text) / 1024**2:.1f} MB)")
+    print(
+        f"  search: {1e3 * t_each:8.2f} ms  search_many: {1e3 * t_many:8.2f} ms  "
+        f"speedup: {t_each / t_many:4.2f}x"
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file = os.path.join(tmpdir, "run.log")
+        with open(file, "w") as fh:
+            fh.write(text)
+        for mmap in (False, True):
+            t_each = bench(
+                lambda: [tmplt.search_file(file, item, mmap=mmap) for item in items],
+                1,
+                repeat=3,
+            )
+            t_many = bench(
+                lambda: tmplt.search_file_many(file, items, mmap=mmap), 1, repeat=3
+            )
+            print(
+                f"  search_file{' (mmap)' if mmap else '       '}: "
+                f"{1e3 * t_each:8.2f} ms  search_file_many: {1e3 * t_many:8.2f} ms  "
+                f"speedup: {t_each / t_many:4.2f}x"
+            )
+
+
+def run_comparisons():
+    bench_patterns()
+    bench_no_match()
+    bench_engines()
+    bench_parse_short()
+    bench_format()
+    bench_format_to()
+    bench_datetime()
+    bench_parse_many()
+    bench_prefilter()
+    bench_lazy()
+    bench_record_type()
+    bench_parse_columns()
+    bench_parse_files()
+    bench_template_set()
+    bench_search_many()
+
+
+# --- Regression suite ------------------------------------------------------------
+#
+# Each workload is set up once and returns the operation to measure. The suite
+# reports the operations per second and the memory allocated by a single operation
+# and compares them with the results of a saved baseline.
+
+
+def workload_compile_deck(tmpdir: str):
+    template, _, _ = physics_output(50)
+    return lambda: ftmplt.Template(template)
+
+
+def workload_parse_short(tmpdir: str):
+    tmplt = ftmplt.Template("Hello, my name is {name} and I am {age:d} years old.")
+    text = tmplt.format(name="John", age=42)
+    return lambda: tmplt.parse(text)
+
+
+def workload_parse_deck(tmpdir: str):
+    template, text, _ = physics_output(50)
+    tmplt = ftmplt.Template(template)
+    return lambda: tmplt.parse(text)
+
+
+def workload_parse_many_fields(tmpdir: str):
+    tmplt = ftmplt.Template(" ".join(f"{{f{i}}}={{v{i}:d}};" for i in range(200)))
+    data = {f"f{i}": f"key{i}" for i in range(200)}
+    data.update({f"v{i}": i for i in range(200)})
+    text = tmplt.format(data)
+    return lambda: tmplt.parse(text)
+
+
+def workload_parse_numeric(tmpdir: str):
+    spec = "%Y-%m-%d %H:%M:%S.%f"
+    tmplt = ftmplt.Template(
+        "[{time:" + spec + "}] step {step:d}: E={e:.8e} dE={de:.2e} occ={occ:.4f}"
+    )
+    start = datetime(2024, 1, 5)
+    lines = [
+        tmplt.format(
+            time=start + timedelta(milliseconds=250 * i),
+            step=i,
+            e=-1.2e2 / (i + 1),
+            de=1e-3 / (i + 1),
+            occ=i / 1000,
+        )
+        for i in range(1000)
+    ]
+    return lambda: list(tmplt.parse_many(lines))
+
+
+def large_log(tmpdir: str, tmplt: ftmplt.Template) -> str:
+    """Write a 3 MB log file with the text of the template at the end."""
+    file = os.path.join(tmpdir, "run.log")
+    if not os.path.exists(file):
+        with open(file, "w") as fh:
+            for i in range(100_000):
+                fh.write(f"step {i}: residual {1 / (i + 1):.6e}\n")
+            fh.write(tmplt.format(energy=-1.5) + "\n")
+    return file
+
+
+def workload_search_file(tmpdir: str):
+    tmplt = ftmplt.Template("Total energy = {energy:.8f} Ha")
+    file = large_log(tmpdir, tmplt)
+    return lambda: tmplt.search_file(file, "energy")
+
+
+def workload_search_file_mmap(tmpdir: str):
+    tmplt = ftmplt.Template("Total energy = {energy:.8f} Ha")
+    file = large_log(tmpdir, tmplt)
+    return lambda: tmplt.search_file(file, "energy", mmap=True)
+
+
+def workload_format_short(tmpdir: str):
+    tmplt = ftmplt.Template("Hello, my name is {name} and I am {age:d} years old.")
+    return lambda: tmplt.format(name="John", age=42)
+
+
+def workload_format_deck(tmpdir: str):
+    template, _, data = physics_output(50)
+    tmplt = ftmplt.Template(template)
+    return lambda: tmplt.format(data)
+
+
+def workload_cold_start(tmpdir: str):
+    template = "Hello, my name is {name} and I am {age:d} years old."
+    text = template.format(name="John", age=42)
+
+    def parse():
+        ftmplt.clear_cache()
+        return ftmplt.parse(template, text)
+
+    return parse
+
+
+# Increase of the peak memory of an operation ignored when comparing results
+MEMORY_SLACK = 1024
+
+WORKLOADS = {
+    "compile_deck": workload_compile_deck,
+    "parse_short": workload_parse_short,
+    "parse_deck": workload_parse_deck,
+    "parse_many_fields": workload_parse_many_fields,
+    "parse_numeric": workload_parse_numeric,
+    "search_file": workload_search_file,
+    "search_file_mmap": workload_search_file_mmap,
+    "format_short": workload_format_short,
+    "format_deck": workload_format_deck,
+    "cold_start": workload_cold_start,
+}
+
+
+def measure(op, min_time: float = 0.2, repeat: int = 5) -> Dict[str, float]:
+    """Measure the throughput and allocations of an operation.
+
+    Parameters
+    ----------
+    op : Callable
+        The operation.
+    min_time : float, optional
+        Minimal duration of each timing run in seconds.
+    repeat : int, optional
+        Number of timing runs, the best is used.
+
+    Returns
+    -------
+    result : dict
+        The operations per second (``ops_per_sec``), the peak memory allocated by
+        a single operation (``peak_bytes``) and the number of memory blocks still
+        allocated after the operation (``blocks``).
+    """
+    timer = timeit.Timer(op)
+    number, t = timer.autorange()
+    number = max(1, int(number * min_time / max(t, 1e-9)))
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    op()  # Warm up caches, so they aren't counted as allocations
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    blocks = len(tracemalloc.take_snapshot().traces)
+    result = op()
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = len(tracemalloc.take_snapshot().traces) - blocks
+    tracemalloc.stop()
+    del result
+    return {"ops_per_sec": 1 / best, "peak_bytes": peak - before, "blocks": blocks}
+
+
+def run_suite(pattern: str = None) -> Dict[str, Dict[str, float]]:
+    """Run the workloads of the regression suite.
+
+    Parameters
+    ----------
+    pattern : str, optional
+        Only workloads whose name contains the RegEx pattern are run.
+
+    Returns
+    -------
+    results : dict[str, dict]
+        The results of each workload, see ``measure``.
+    """
+    results = dict()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, setup in WORKLOADS.items():
+            if pattern and not re.search(pattern, name):
+                continue
+            results[name] = result = measure(setup(tmpdir))
+            print(
+                f"  {name:<18} {result['ops_per_sec']:12.1f} ops/s  "
+                f"{result['peak_bytes'] / 1024:10.1f} KiB peak  "
+                f"{result['blocks']:6d} blocks"
+            )
+    return results
+
+
+def save_results(file: str, results: Dict[str, Dict[str, float]]) -> None:
+    """Save the results of the regression suite as JSON."""
+    data = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "results": results,
+    }
+    with open(file, "w") as fh:
+        json.dump(data, fh, indent=2)
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline_file: str, threshold: float = 0.1
+) -> List[str]:
+    """Compare the results of the regression suite with a saved baseline.
+
+    Parameters
+    ----------
+    results : dict[str, dict]
+        The results of the regression suite, see ``run_suite``.
+    baseline_file : str
+        The JSON file of the baseline results, see ``save_results``.
+    threshold : float, optional
+        The relative loss of throughput or increase of allocated memory that is
+        reported as regression, by default 10%. Timings on shared or busy
+        machines can vary by more than that, so use a larger threshold there.
+
+    Returns
+    -------
+    regressions : list[str]
+        The names of the workloads that regressed.
+    """
+    with open(baseline_file) as fh:
+        baseline = json.load(fh)["results"]
+    regressions = list()
+    print(f"Comparison with {baseline_file} (threshold {100 * threshold:.0f}%)")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"  {name:<18} no baseline")
+            continue
+        speed = result["ops_per_sec"] / baseline[name]["ops_per_sec"]
+        # Changes of small peaks by a few objects are ignored
+        peak, base_peak = result["peak_bytes"], baseline[name]["peak_bytes"]
+        memory = (peak + 1) / (base_peak + 1)
+        regressed = speed < 1 - threshold
+        regressed |= peak > (1 + threshold) * base_peak + MEMORY_SLACK
+        if regressed:
+            regressions.append(name)
+        print(
+            f"  {name:<18} speed: {speed:5.2f}x  memory: {memory:5.2f}x"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+def main(argv: Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suite", action="store_true", help="run the regression suite")
+    parser.add_argument("-k", dest="pattern", help="only run matching workloads")
+    parser.add_argument("--save", help="save the suite results to a JSON file")
+    parser.add_argument("--baseline", help="compare with saved suite results")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative change reported as regression (default: 0.1)",
+    )
+    args = parser.parse_args(argv)
+    if not (args.suite or args.pattern or args.save or args.baseline):
+        run_comparisons()
+        return 0
+
+    print("Regression suite")
+    results = run_suite(args.pattern)
+    if args.save:
+        save_results(args.save, results)
+    if args.baseline:
+        return 1 if compare(results, args.baseline, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
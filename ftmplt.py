@@ -51,29 +51,81 @@ to the functions above:
 "Hello, my name is John and I am 42 years old."
 """
 
+import array
+import asyncio
+import builtins
+import collections.abc
+import concurrent.futures
+import contextlib
 import dataclasses
+import functools
+import hashlib
+import mmap
+import os
+import pickle
 import re
 import string
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict, namedtuple
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import (
+    IO,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 
 __all__ = [
     "CustomFormatter",
+    "LazyResult",
+    "ParseError",
     "Template",
+    "TemplateSet",
     "parse",
     "search",
     "format",
     "parse_file",
     "search_file",
     "format_file",
+    "clear_cache",
+    "cache_info",
+    "set_cache_size",
 ]
 
 Key = Union[int, str]
 Value = Any
 Data = Dict[Key, Value]
 SearchResult = Tuple[Value, Tuple[int, int]]
+Column = Union[array.array, List[Value]]
+ENGINES = ("auto", "regex", "scan")
+ON_ERROR = ("raise", "skip", "collect")
+EXECUTORS = ("process", "thread")
+RECORD_TYPES = ("dict", "namedtuple")
+# Version of the serialization format of compiled templates
+STATE_VERSION = 1
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+Timing = namedtuple("Timing", ["calls", "time"])
+FormatPlan = Tuple[Tuple[str, Key, Optional[Callable[[Value], Value]], str], ...]
+
+# Conversions of format fields (!r, !s and !a)
+CONVERSIONS = {"r": repr, "s": str, "a": ascii}
 
 # Integer format specifiers
 FMT_INT = (
@@ -134,7 +186,25 @@ FMT_DT = [
 
 @dataclasses.dataclass
 class FormatField:
-    """Dataclass for a single format-string field."""
+    """Dataclass for a single format-string field.
+
+    The RegEx pattern for searching the field is compiled from `source` and
+    `flags` on first use. The fields use ``__slots__`` instead of an instance
+    dictionary, so they have no default values.
+    """
+
+    __slots__ = (
+        "name",
+        "spec",
+        "conv",
+        "fstr",
+        "type",
+        "base",
+        "source",
+        "group_name",
+        "flags",
+        "_pattern",
+    )
 
     name: str
     spec: str
@@ -142,8 +212,19 @@ class FormatField:
     fstr: str
     type: type
     base: int
-    pattern: re.Pattern
+    source: Union[str, bytes]
     group_name: str
+    flags: int
+
+    def __post_init__(self) -> None:
+        self._pattern: Optional[re.Pattern] = None
+
+    @property
+    def pattern(self) -> re.Pattern:
+        """The compiled RegEx pattern for searching the field."""
+        if self._pattern is None:
+            self._pattern = re.compile(self.source, flags=self.flags)
+        return self._pattern
 
 
 def format_string(name: str = None, spec: str = None, conv: str = None) -> str:
@@ -215,23 +296,488 @@ def _format_type(spec: str = None) -> Optional[Tuple[Optional[type], Optional[in
     )
 
 
-def _convert_type(field: FormatField, value: Value) -> Value:
-    """Convert value to given type."""
+# Format specifier: [[fill]align][sign][z][#][0][width][grouping][.precision][type]
+RE_SPEC = re.compile(
+    r"(?:(?P<fill>.)?(?P<align>[<>=^]))?(?P<sign>[-+ ])?z?(?P<alt>#)?(?P<zero>0)?"
+    r"(?P<width>\d+)?(?P<grouping>[,_])?(?:\.(?P<precision>\d+))?(?P<type>.*)$",
+    flags=re.DOTALL,
+)
+
+# RegEx patterns of the format field values
+PATTERN_ANY = r"[\s\S]*?"
+PATTERN_DIGITS = {
+    None: r"[\d_]+",
+    2: r"(?:0[bB])?[01_]+",
+    8: r"(?:0[oO])?[0-7_]+",
+    16: r"(?:0[xX])?[\da-fA-F_]+",
+}
+PATTERN_FLOAT = (
+    r"(?:(?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eEdD][-+]?\d+)?"
+    r"|(?i:inf(?:inity)?|nan))"
+)
+
+
+def _field_pattern(
+    spec: str = None, type_: type = None, base: int = None, bounded: bool = False
+) -> str:
+    """Return the RegEx pattern matching the value of a single field.
+
+    Parameters
+    ----------
+    spec : str, optional
+        Format specifier, by default None.
+    type_ : type, optional
+        Type of the format specifier, see ``_format_type``.
+    base : int, optional
+        Base of integer format specifiers, see ``_format_type``.
+    bounded : bool, optional
+        If True, the field is not at the start or end of the template and the width
+        of the format specifier is used as minimal length of untyped fields.
+        By default False.
+
+    Returns
+    -------
+    pattern : str
+    """
+    if type_ is int:
+        return r"\s*[-+]?" + PATTERN_DIGITS[base] + r"\s*?"
+    if type_ is float:
+        suffix = "%" if spec.endswith("%") else ""
+        return r"\s*[-+]?" + PATTERN_FLOAT + suffix + r"\s*?"
+    if type_ is None and spec and bounded:
+        width = RE_SPEC.match(spec).group("width")
+        if width:
+            return r"[\s\S]{%d,}?" % int(width)
+    return PATTERN_ANY
+
+
+def _to_float(value: Union[str, bytes]) -> float:
+    """Convert value to float, accepting Fortran double-precision exponents."""
+    try:
+        return float(value)
+    except ValueError:
+        if not isinstance(value, str):
+            value = value.decode("latin-1")
+        return float(value.replace("d", "e").replace("D", "E"))
+
+
+def _to_percent(value: Union[str, bytes]) -> float:
+    """Convert a percentage to float."""
+    return _to_float(value.strip()[:-1]) / 100
+
+
+# Numeric datetime directives parsed without ``datetime.strptime``: The RegEx of
+# the value and the ISO 8601 field of the directive with its default value.
+DT_DIRECTIVES = {
+    "Y": (r"[0-9]{4}", "{}", "1900"),
+    "m": (r"[0-9]{2}", "-{}", "-01"),
+    "d": (r"[0-9]{2}", "-{}", "-01"),
+    "H": (r"[0-9]{2}", "T{}", "T00"),
+    "M": (r"[0-9]{2}", ":{}", ":00"),
+    "S": (r"[0-9]{2}", ":{}", ":00"),
+    "f": (r"[0-9]{1,6}", ".{:0<6}", ".000000"),
+}
+# Number of recently parsed values memoized by each datetime parser
+DT_MEMO_SIZE = 1024
+
+
+def _datetime_pattern(
+    spec: str, capture: bool = True
+) -> Optional[Tuple[str, Dict[str, int]]]:
+    """Return the RegEx pattern matching zero-padded values of a datetime specifier.
+
+    Parameters
+    ----------
+    spec : str
+        The datetime format specifier.
+    capture : bool, optional
+        If True (default), the pattern has a group for each directive.
+
+    Returns
+    -------
+    pattern : str
+        The source of the RegEx pattern.
+    groups : dict[str, int]
+        The index of the group of each directive.
+    None
+        If the specifier contains directives other than the numeric directives in
+        ``DT_DIRECTIVES`` or a directive more than once.
+    """
+    group = "({})" if capture else "(?:{})"
+    parts, groups = list(), dict()
+    i = 0
+    while i < len(spec):
+        char = spec[i]
+        if char != "%":
+            parts.append(re.escape(char))
+            i += 1
+            continue
+        directive = spec[i + 1 : i + 2]
+        if directive == "%":
+            parts.append("%")
+        elif directive in DT_DIRECTIVES and directive not in groups:
+            groups[directive] = len(groups)
+            parts.append(group.format(DT_DIRECTIVES[directive][0]))
+        else:
+            return None
+        i += 2
+    return "".join(parts), groups
+
+
+def _compile_datetime(spec: str) -> Optional[Tuple[Callable, str]]:
+    """Compile a datetime format specifier for ``datetime.fromisoformat``.
+
+    Parameters
+    ----------
+    spec : str
+        The datetime format specifier.
+
+    Returns
+    -------
+    match : Callable
+        The ``fullmatch`` method of a RegEx matching zero-padded values of the
+        specifier, with a group for each directive.
+    iso_format : str
+        A format string converting the groups of the match to an ISO 8601 string.
+    None
+        If the specifier contains directives other than the numeric directives in
+        ``DT_DIRECTIVES`` or a directive more than once.
+    """
+    compiled = _datetime_pattern(spec)
+    if compiled is None:
+        return None
+    pattern, groups = compiled
+    iso_format = ""
+    for directive, (_, field, default) in DT_DIRECTIVES.items():
+        if directive in groups:
+            iso_format += field.replace("{", "{%d" % groups[directive])
+        else:
+            iso_format += default
+    return re.compile(pattern).fullmatch, iso_format
+
+
+@functools.lru_cache(maxsize=256)
+def _datetime_parser(spec: str) -> Callable[[Union[str, bytes]], datetime]:
+    """Return a function parsing the values of a datetime format specifier.
+
+    ``datetime.strptime`` takes a lock, looks up the locale and the compiled format
+    for every value. Specifiers consisting of numeric directives and literal text
+    are instead matched with a RegEx, the digits are rearranged to an ISO 8601
+    string and parsed with ``datetime.fromisoformat``. Values not matching the
+    RegEx, for example without zero-padding, and all other specifiers are parsed
+    with ``datetime.strptime``, so the results and errors are the same. The last
+    ``DT_MEMO_SIZE`` parsed values are memoized.
+
+    Parameters
+    ----------
+    spec : str
+        The datetime format specifier.
+
+    Returns
+    -------
+    parser : Callable
+        The function converting the text of a field to datetime.
+    """
+    compiled = _compile_datetime(spec)
+
+    @functools.lru_cache(maxsize=DT_MEMO_SIZE)
+    def parse(value: Union[str, bytes]) -> datetime:
+        if not isinstance(value, str):
+            value = value.decode("latin-1")
+        if compiled is not None:
+            match, iso_format = compiled
+            m = match(value)
+            if m is not None:
+                try:
+                    return datetime.fromisoformat(iso_format.format(*m.groups()))
+                except ValueError:
+                    pass  # Out of range, let strptime raise the error
+        return datetime.strptime(value, spec)
+
+    return parse
+
+
+def _get_converter(field: FormatField, binary: bool = False) -> Callable[[str], Value]:
+    """Return the function converting the text of a field to its type.
+
+    If `binary` is True, the text of the field is bytes. Numbers are converted
+    directly from bytes and untyped fields are returned as bytes.
+    """
     # Parse int
     if field.type is int:
-        return int(value, field.base) if field.base else int(value)
+        return functools.partial(int, base=field.base) if field.base else int
     # Parse float
     if field.type is float:
-        if field.spec.endswith("%"):
-            value = float(value[:-1]) / 100
-        else:
-            value = float(value)
-        return value
+        return _to_percent if field.spec.endswith("%") else _to_float
     # Parse datetime
     if field.type is datetime:
-        return datetime.strptime(value, field.spec)
+        return _datetime_parser(field.spec)
     # Parse string
-    return value.strip()
+    return bytes.strip if binary else str.strip
+
+
+def _to_ndarray(column: array.array) -> "np.ndarray":
+    """Return a NumPy array sharing the memory of an ``array.array`` buffer."""
+    if not column:
+        return np.empty(0, dtype=column.typecode)
+    return np.frombuffer(column, dtype=column.typecode)
+
+
+def _convert_column(
+    convert: Callable[[str], Value], raws: Sequence[str], typecode: str = None
+) -> Column:
+    """Convert the raw values of a column in bulk.
+
+    Parameters
+    ----------
+    convert : Callable
+        The converter function of the field.
+    raws : Sequence[str]
+        The raw values of the field.
+    typecode : str, optional
+        The typecode of the ``array.array`` buffer to convert the values to. If
+        None, the values are returned as list.
+
+    Returns
+    -------
+    column : array.array or list
+        The converted values. Integers exceeding the range of the buffer are
+        returned as list.
+    """
+    if typecode is None:
+        return list(map(convert, raws))
+    if convert is _to_float:
+        # Use the builtin directly, unless there are Fortran exponents
+        try:
+            return array.array(typecode, map(float, raws))
+        except ValueError:
+            pass
+    try:
+        return array.array(typecode, map(convert, raws))
+    except OverflowError:
+        return list(map(convert, raws))
+
+
+def _match_iter(pattern: re.Pattern, text: Union[str, bytes]) -> Iterator[re.Match]:
+    """Iterate over the consecutive matches of the pattern from the start of text.
+
+    If a template starts with an untyped field, a match starting at any position
+    can be extended to a match starting at the previous position. ``finditer``
+    therefore finds the same matches as matching at the end of the last match,
+    but tries every later position again if there is no match.
+    """
+    pos = 0
+    while pos <= len(text):
+        match = pattern.match(text, pos)
+        if match is None:
+            return
+        yield match
+        pos = match.end() if match.end() > pos else pos + 1
+
+
+@contextlib.contextmanager
+def _map_file(file: Union[str, Path]) -> Iterator[Union[mmap.mmap, bytes]]:
+    """Memory-maps a file for reading.
+
+    Parameters
+    ----------
+    file : str or pathlib.Path
+        The path of the file.
+
+    Yields
+    ------
+    buffer : mmap.mmap or bytes
+        The read-only memory map of the file. Empty files can't be mapped, in
+        this case an empty bytes object is returned.
+    """
+    with open(file, "rb") as fh:
+        try:
+            buffer = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            yield b""
+            return
+        with buffer:
+            yield buffer
+
+
+def _encode_pattern(
+    source: str, flags: int = 0, encoding: str = "latin-1"
+) -> re.Pattern:
+    """Compile the bytes version of a str RegEx pattern.
+
+    Parameters
+    ----------
+    source : str
+        The source of the str pattern.
+    flags : int, optional
+        The RegEx flags of the str pattern.
+    encoding : str, optional
+        The encoding used to encode the literal text in the pattern. Latin-1 maps
+        each character of the pattern to the byte with the same value.
+
+    Returns
+    -------
+    pattern : re.Pattern
+        The compiled bytes pattern. Character classes and ignoring case only
+        apply to ASCII characters.
+    """
+    return re.compile(source.encode(encoding), flags=flags & ~re.UNICODE)
+
+
+# Characters removed by ``bytes.strip``
+BYTES_WHITESPACE = frozenset(b" \t\n\r\x0b\x0c")
+RE_BYTES_LEADING = re.compile(rb"[ \t\n\r\x0b\x0c]*")
+
+
+def _strip_bounds(buffer: Union[bytes, memoryview, mmap.mmap]) -> Tuple[int, int]:
+    """Return the bounds of a bytes-like buffer without leading/trailing whitespace."""
+    start = RE_BYTES_LEADING.match(buffer).end()
+    end = len(buffer)
+    while end > start and buffer[end - 1] in BYTES_WHITESPACE:
+        end -= 1
+    return start, end
+
+
+def _strip_bytes(text: Union[bytes, bytearray, memoryview]) -> Union[bytes, memoryview]:
+    """Strip whitespace from bytes-like text, memoryviews are sliced without copy."""
+    if isinstance(text, memoryview):
+        if text.format != "B":
+            text = text.cast("B")
+        start, end = _strip_bounds(text)
+        return text[start:end]
+    return text.strip()
+
+
+def _decode_latin1(value: Value) -> Value:
+    """Decode bytes-like values to str, mapping each byte to the same character."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode("latin-1")
+    return value
+
+
+def _chain(funcs: Sequence[Callable[[Value], Value]], value: Value) -> Value:
+    """Apply the functions to the value one after another."""
+    for func in funcs:
+        value = func(value)
+    return value
+
+
+def _check_timeout(timeout: Optional[float], engine: str) -> None:
+    """Raise an error if a time budget is given for the RegEx engine."""
+    if timeout is not None and engine != "scan":
+        raise ValueError(
+            f"A timeout requires the scan engine, the {engine} engine can't be "
+            "interrupted. Use engine='scan'."
+        )
+
+
+@functools.lru_cache(maxsize=256)
+def _record_class(names: Tuple[str, ...]) -> type:
+    """Return the named tuple class of the records of templates with the fields.
+
+    Names that aren't valid identifiers, like the names of indexed fields, are
+    replaced by an underscore and the position of the field. The class is cached
+    for the names and the records are pickled with the names instead of a
+    reference to the class, so records can be sent to worker processes.
+    """
+    base = namedtuple("Record", names, rename=True)
+    namespace = {"__slots__": (), "_names": names, "__reduce__": _reduce_record}
+    return type("Record", (base,), namespace)
+
+
+def _reduce_record(record: tuple) -> Tuple[Callable, tuple]:
+    """Pickle a record with the field names of the template."""
+    return _new_record, (record._names, tuple(record))
+
+
+def _new_record(names: Tuple[str, ...], values: tuple) -> tuple:
+    """Create a record of the template fields, used for unpickling records."""
+    return _record_class(names)(*values)
+
+
+def _default_cache_dir() -> Path:
+    """Return the directory of the on-disk cache of compiled templates."""
+    cache_dir = os.environ.get("FTMPLT_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+    return Path.home() / ".cache" / "ftmplt"
+
+
+@functools.lru_cache(maxsize=None)
+def _code_hash() -> Optional[str]:
+    """Return a hash of the source of this module or None if it can't be read.
+
+    The hash is part of the keys of the on-disk cache, so compiled templates
+    cached by a different version of the code are not loaded.
+    """
+    try:
+        return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+    except (NameError, OSError):
+        return None
+
+
+# Inline letters of the RegEx flags that can be scoped to a group
+INLINE_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s", re.VERBOSE: "x"}
+
+
+def _unnamed_pattern(pattern: re.Pattern) -> Tuple[str, str]:
+    """Return the source of a template pattern without group names.
+
+    Parameters
+    ----------
+    pattern : re.Pattern
+        The pattern of a template, see ``_compile_fields``.
+
+    Returns
+    -------
+    source : str
+        The source of the pattern with unnamed groups. Since the literal text of
+        the template is escaped, ``(?P<`` only occurs at the start of a group.
+    letters : str
+        The inline letters of the flags of the pattern (e.g. ``i``) to scope the
+        flags to a group.
+    """
+    source = pattern.pattern
+    if isinstance(source, bytes):
+        source = source.decode("latin-1")
+    source = re.sub(r"\(\?P<\w+>", "(", source)
+    letters = "".join(c for flag, c in INLINE_FLAGS.items() if pattern.flags & flag)
+    return source, letters
+
+
+def _literal_prefilter(
+    leading: Union[str, bytes], trailing: Union[str, bytes], interior: Union[str, bytes]
+) -> Callable[[Union[str, bytes]], bool]:
+    """Return a function checking if a text contains the literal text of a template.
+
+    Parameters
+    ----------
+    leading : str or bytes
+        The literal text at the start of the template.
+    trailing : str or bytes
+        The literal text at the end of the template.
+    interior : str or bytes
+        The longest literal text between two fields of the template.
+
+    Returns
+    -------
+    prefilter : Callable
+        Function returning False if the text can't match the template. Bytes-like
+        objects without string methods (memoryviews) are always accepted.
+    """
+
+    def prefilter(text: Union[str, bytes]) -> bool:
+        try:
+            return (
+                text.startswith(leading)
+                and text.endswith(trailing)
+                and interior in text
+            )
+        except AttributeError:
+            return True
+
+    return prefilter
 
 
 def _split_data(data: Dict[Key, Any]) -> Tuple[Tuple[Any], Dict[str, Any]]:
@@ -257,43 +803,37 @@ def _split_data(data: Dict[Key, Any]) -> Tuple[Tuple[Any], Dict[str, Any]]:
     return tuple(args), kwargs
 
 
-def _compile_fields(
-    template: str, ignore_case: bool = False, flags: Union[int, re.RegexFlag] = None
-) -> Tuple[List[FormatField], re.Pattern]:
-    """Compile format fields in template string and generate RegEx pattern.
+def _split_template(template: str) -> List[Tuple[str, str, str, str, str, str, bool]]:
+    """Split a template string into its literal text and format fields.
 
     Parameters
     ----------
     template : str
         Template string.
-    ignore_case : bool, optional
-        Ignore case when matching fields, by default False.
-    flags : int or re.RegexFlag, optional
-        Additional RegEx flags.
 
     Returns
     -------
-    fields : list[FormatField]
-        List of format-string fields.
-    pattern : re.Pattern
-        Compiled RegEx pattern for parsing text with the template.
+    items : list[tuple]
+        The items ``(text, name, spec, conv, group_name, text_suffix, bounded)`` of
+        the fields, where `text` is the literal text before and `text_suffix` the
+        literal text after the field. `bounded` is True if the field is neither at
+        the start nor at the end of the template.
     """
-    if flags is None:
-        flags = 0
-    if ignore_case:
-        flags |= re.IGNORECASE
-
     template = template.strip()
-    items = list(string.Formatter().parse(template))
-    if any(x is not None for x in items[-1][1:]):
-        # Last char belongs to fstring, add empty end char
-        items.append(("", None, None, None))
-
-    fields = list()
+    items = list()
     text_suffix = ""
-    pattern_str_full = ""
+    for text, name, spec, conv in string.Formatter().parse(template):
+        if name is None:
+            # Literal text only, at the end or before an escaped brace
+            text_suffix += text
+            continue
+        items.append((text_suffix + text, name, spec, conv))
+        text_suffix = ""
+    # Literal text after the last field
+    items.append((text_suffix, None, None, None))
+
+    parts = list()
     empty, pos = False, 0
-    group_names = set()
     for i in range(len(items) - 1):
         text, name, spec, conv = items[i]
         if not name:
@@ -311,19 +851,110 @@ def _compile_fields(
             # name = ""
         else:
             group_name = name
+        text_suffix = items[i + 1][0]
+        # Padding of fields at the start or end is removed by stripping the text
+        bounded = bool(text or i > 0) and bool(text_suffix or i < len(items) - 2)
+        parts.append((text, name, spec, conv, group_name, text_suffix, bounded))
+    return parts
+
+
+def _literal_text(template: str) -> str:
+    """Return the stripped literal text of a template without format fields."""
+    return "".join(item[0] for item in string.Formatter().parse(template.strip()))
+
+
+def _compile_format(template: str) -> Optional[Tuple[FormatPlan, str]]:
+    """Compile the steps for formatting data with a template string.
+
+    Parameters
+    ----------
+    template : str
+        Template string. Unlike for parsing, the template is not stripped.
+
+    Returns
+    -------
+    steps : tuple[tuple]
+        The steps ``(text, key, conversion, spec)`` of the fields, where `text` is
+        the literal text before the field and `conversion` the function of the
+        conversion (``!r``, ``!s`` or ``!a``) of the field or None.
+    text_suffix : str
+        The literal text after the last field.
+
+    Returns None if the template uses features that require ``str.format``,
+    like nested replacement fields in the format specifier, attribute or index
+    access or mixing automatic and manual field numbering. Unknown conversions
+    are left to ``str.format`` as well, which raises its usual error.
+    """
+    steps = list()
+    text_suffix = ""
+    auto, manual = 0, False
+    for text, name, spec, conv in string.Formatter().parse(template):
+        text = text_suffix + text
+        if name is None:
+            # Literal text only, at the end or before an escaped brace
+            text_suffix = text
+            continue
+        text_suffix = ""
+        if "{" in spec or "." in name or "[" in name:
+            return None
+        if conv and conv not in CONVERSIONS:
+            return None
+        if not name:
+            key = auto
+            auto += 1
+        elif name.isdigit():
+            key = int(name)
+            manual = True
+        else:
+            key = name
+        steps.append((text, key, CONVERSIONS.get(conv), spec))
+    if auto and manual:
+        return None
+    return tuple(steps), text_suffix
+
+
+def _compile_fields(
+    template: str, ignore_case: bool = False, flags: Union[int, re.RegexFlag] = None
+) -> Tuple[List[FormatField], re.Pattern]:
+    """Compile format fields in template string and generate RegEx pattern.
 
+    Parameters
+    ----------
+    template : str
+        Template string.
+    ignore_case : bool, optional
+        Ignore case when matching fields, by default False.
+    flags : int or re.RegexFlag, optional
+        Additional RegEx flags.
+
+    Returns
+    -------
+    fields : list[FormatField]
+        List of format-string fields.
+    pattern : re.Pattern
+        Compiled RegEx pattern for parsing text with the template. The pattern is
+        not anchored, use ``fullmatch`` to match a whole text.
+    """
+    flags = _regex_flags(ignore_case, flags)
+
+    fields = list()
+    # Templates without fields only consist of literal text
+    text_suffix = _literal_text(template)
+    pattern_str_full = ""
+    group_names = set()
+    for item in _split_template(template):
+        text, name, spec, conv, group_name, text_suffix, bounded = item
         # Initialize field
         fstr = format_string(name, spec, conv)
-        text_suffix = items[i + 1][0]
         type_, base = _format_type(spec)
         if group_name in group_names:
-            group = r"((\n|.)*)"
+            group = r"(?:[\s\S]*)"
         else:
-            group = rf"(?P<{group_name}>(\n|.)*?)"
-            pattern_str = re.escape(text) + group + re.escape(text_suffix)
-            pattern = re.compile(pattern_str, flags=flags)
+            value_pattern = _field_pattern(spec, type_, base, bounded)
+            group = rf"(?P<{group_name}>{value_pattern})"
+            source = re.escape(text) + group + re.escape(text_suffix)
             field = FormatField(
-                name, spec, conv, fstr, type_, base, pattern, group_name
+                name, spec, conv, fstr, type_, base, source, group_name, flags
             )
             fields.append(field)
 
@@ -333,11 +964,233 @@ def _compile_fields(
 
     # Use last text suffix for end of string
     pattern_str_full = pattern_str_full + re.escape(text_suffix)
-    pattern_full = re.compile(pattern_str_full + r"$", flags=flags)
+    pattern_full = re.compile(pattern_str_full, flags=flags)
 
     return fields, pattern_full
 
 
+def _regex_flags(ignore_case: bool = False, flags: Union[int, re.RegexFlag] = None):
+    """Return the RegEx flags for the given matching options."""
+    if flags is None:
+        flags = 0
+    if ignore_case:
+        flags |= re.IGNORECASE
+    return flags
+
+
+class _Scanner:
+    """Linear-time matcher for the text between the fields of a template.
+
+    Instead of matching the whole text with a single RegEx pattern, the literal
+    text between the fields is located segment by segment from left to right,
+    always using the first occurrence. The text in between is sliced out as the
+    value of the field. Typed fields are validated with the RegEx pattern of the
+    field value, which only ever sees the sliced text. Since every character is
+    visited a bounded number of times, the matching time is linear in the length
+    of the text.
+
+    Parameters
+    ----------
+    template : str
+        Template string.
+    fields : list[FormatField]
+        The compiled fields of the template.
+    flags : int or re.RegexFlag, optional
+        RegEx flags used to locate the literal text. If no flags are given plain
+        string operations are used.
+    """
+
+    def __init__(self, template: str, fields: List[FormatField], flags: int = 0):
+        index = {field.group_name: i for i, field in enumerate(fields)}
+        self.literals = list()
+        self.slots = list()
+        text_suffix = _literal_text(template)
+        for item in _split_template(template):
+            text, name, spec, conv, group_name, text_suffix, bounded = item
+            self.literals.append(text)
+            if group_name not in index:
+                # Duplicate field, the value is not used
+                self.slots.append((None, None))
+                continue
+            type_, base = _format_type(spec)
+            value_pattern = _field_pattern(spec, type_, base, bounded)
+            validator = None
+            if value_pattern != PATTERN_ANY:
+                validator = re.compile(value_pattern, flags=flags).fullmatch
+            self.slots.append((index.pop(group_name), validator))
+        self.literals.append(text_suffix)
+        self.num_fields = len(fields)
+
+        self._slot_index = {index: i for i, (index, _) in enumerate(self.slots)}
+        self.validators = [None] * len(fields)
+        for index, validator in self.slots:
+            if index is not None:
+                self.validators[index] = validator
+
+        # Steps of the string scanner: field index, validator, next literal and length
+        self._steps = [
+            (index, validator, literal, len(literal))
+            for (index, validator), literal in zip(self.slots, self.literals[1:])
+        ][:-1]
+
+        self.flags = flags
+        # The scanner gives the same results as the RegEx pattern if all fields are
+        # untyped and unique and no flags are used: The lazy groups of the pattern
+        # then take the shortest value for which the rest of the text still
+        # matches, which is the first occurrence of the following literal text.
+        self.exact = not flags and all(
+            i is not None and v is None for i, v in self.slots
+        )
+        self._finders = None
+        if flags:
+            escaped = [re.escape(literal) for literal in self.literals]
+            self._finders = [re.compile(e, flags=flags).search for e in escaped]
+            self._end_finder = re.compile(escaped[-1] + r"\Z", flags=flags).search
+
+    def _find(self, i: int, text: str, pos: int, last: bool = False) -> Tuple[int, int]:
+        """Return the span of the first occurrence of literal `i` after `pos`.
+
+        If `last` is True, the literal has to be at the end of the text.
+        """
+        if self._finders is not None:
+            finder = self._end_finder if last else self._finders[i]
+            match = finder(text, pos)
+            return (-1, -1) if match is None else match.span()
+        literal = self.literals[i]
+        if last:
+            start = len(text) - len(literal)
+            if start < pos or not text.endswith(literal):
+                return -1, -1
+        else:
+            start = text.find(literal, pos)
+            if start < 0:
+                return -1, -1
+        return start, start + len(literal)
+
+    def match(self, text: str, deadline: float = None) -> Optional[List[str]]:
+        """Match the whole text and return the raw field values.
+
+        Parameters
+        ----------
+        text : str
+            The (stripped) text to match.
+        deadline : float, optional
+            Time of the performance counter after which the matching is aborted.
+
+        Returns
+        -------
+        values : list[str] or None
+            The raw values of the fields or None if the text does not match.
+        """
+        if not self.slots:
+            return [] if self._find(0, text, 0, last=True) == (0, len(text)) else None
+        if self._finders is None and deadline is None:
+            if self.exact:
+                return self._match_exact(text)
+            return self._match_plain(text)
+        start, pos = self._find(0, text, 0)
+        if start != 0:
+            return None
+
+        values = [None] * self.num_fields
+        last = len(self.slots) - 1
+        for i, (index, validator) in enumerate(self.slots):
+            end, next_pos = self._find(i + 1, text, pos, last=i == last)
+            if end < 0:
+                return None
+            if index is not None:
+                value = text[pos:end]
+                if validator is not None and validator(value) is None:
+                    return None
+                values[index] = value
+            pos = next_pos
+            if deadline is not None and time.perf_counter() > deadline:
+                raise TimeoutError("Matching the text exceeded the time budget")
+        return values
+
+    def _match_exact(self, text: str) -> Optional[List[str]]:
+        """Match the whole text of a template with untyped and unique fields."""
+        first, last = self.literals[0], self.literals[-1]
+        if not text.startswith(first):
+            return None
+        pos = len(first)
+        values = list()
+        append = values.append
+        find = text.find
+        for _, _, literal, size in self._steps:
+            end = find(literal, pos)
+            if end < 0:
+                return None
+            append(text[pos:end])
+            pos = end + size
+        end = len(text) - len(last)
+        if end < pos or not text.endswith(last):
+            return None
+        append(text[pos:end])
+        return values
+
+    def _match_plain(self, text: str) -> Optional[List[str]]:
+        """Match the whole text using string operations only."""
+        literals = self.literals
+        if not text.startswith(literals[0]):
+            return None
+        pos = len(literals[0])
+        values = [None] * self.num_fields
+        find = text.find
+        for index, validator, literal, size in self._steps:
+            if size:
+                end = find(literal, pos)
+                if end < 0:
+                    return None
+            else:
+                end = pos
+            if index is not None:
+                value = text[pos:end]
+                if validator is not None and validator(value) is None:
+                    return None
+                values[index] = value
+            pos = end + size
+
+        # The last literal has to be at the end of the text
+        literal = literals[-1]
+        end = len(text) - len(literal)
+        if end < pos or not text.endswith(literal):
+            return None
+        index, validator = self.slots[-1]
+        if index is not None:
+            value = text[pos:end]
+            if validator is not None and validator(value) is None:
+                return None
+            values[index] = value
+        return values
+
+    def search(self, text: str, index: int) -> Optional[Tuple[str, Tuple[int, int]]]:
+        """Search the first occurrence of an untyped field in the text.
+
+        Parameters
+        ----------
+        text : str
+            The text to search.
+        index : int
+            The index of the field.
+
+        Returns
+        -------
+        value : str
+            The raw value of the field.
+        span : tuple[int, int]
+            The span of the value in the text.
+        """
+        i = self._slot_index[index]
+        _, start = self._find(i, text, 0)
+        if start < 0:
+            return None
+        end, _ = self._find(i + 1, text, start)
+        if end < 0:
+            return None
+        return text[start:end], (start, end)
+
+
 def _get_field(fields: List[FormatField], item: Key) -> FormatField:
     """Get field by name or index.
 
@@ -359,6 +1212,74 @@ def _get_field(fields: List[FormatField], item: Key) -> FormatField:
     raise KeyError(f"Field {item} not found")
 
 
+class ParseError(ValueError):
+    """Error raised if a text can not be parsed with a template.
+
+    Parameters
+    ----------
+    message : str
+        The error message.
+    index : int, optional
+        The index of the text in a batch of texts.
+    text : str, optional
+        The text that could not be parsed.
+    """
+
+    def __init__(self, message: str, index: int = None, text: str = None):
+        super().__init__(message)
+        self.index = index
+        self.text = text
+
+
+class LazyResult(collections.abc.Mapping):
+    """Read-only mapping of parsed data converting each field on first access.
+
+    Returned by ``Template.parse`` with ``lazy=True``. The raw values of the fields
+    are kept and a value is only converted when it is accessed for the first time.
+    Iterating over the result or converting it to a dictionary gives the same data
+    as a regular parse. Errors converting a value are raised when it is accessed.
+
+    Parameters
+    ----------
+    values : Sequence[str]
+        The raw values of the fields.
+    plan : dict[str|int, tuple[int, Callable]]
+        The index of the raw value and the converter function of each key.
+    """
+
+    __slots__ = ("_values", "_plan", "_data")
+
+    def __init__(self, values: Sequence[str], plan: Dict[Key, Tuple[int, Callable]]):
+        self._values = values
+        self._plan = plan
+        self._data = dict()
+
+    def __getitem__(self, key: Key) -> Value:
+        try:
+            return self._data[key]
+        except KeyError:
+            index, convert = self._plan[key]
+            value = self._data[key] = convert(self._values[index])
+            return value
+
+    def __contains__(self, key: object) -> bool:
+        # Don't convert the value, which could raise a conversion error
+        return key in self._plan
+
+    def __iter__(self) -> Iterator[Key]:
+        return iter(self._plan)
+
+    def __len__(self) -> int:
+        return len(self._plan)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+    def __reduce__(self):
+        # The converters may not be picklable, the result is pickled as dictionary
+        return dict, (dict(self),)
+
+
 class CustomFormatter(ABC):
     """Custom formatter for parsing and formatting a specific format field."""
 
@@ -381,34 +1302,102 @@ class Template:
 
     Parameters
     ----------
-    template : str
-        The template format string.
+    template : str or bytes
+        The template format string. If the template is bytes, the template parses
+        bytes-like text and formats bytes. Untyped fields are parsed as bytes.
     handlers : CustomFormatter
         Custom formatters to use when parsing fields.
     ignore_case : bool, optional
         Ignore case when matching fields, by default False.
     flags : int or re.RegexFlag, optional
         Additional RegEx flags.
+    engine : {"auto", "regex", "scan"}, optional
+        The matching engine used for parsing text. The "regex" engine matches the
+        whole text with a single RegEx pattern. The "scan" engine locates the
+        literal text between the fields from left to right and guarantees linear
+        matching time, but always uses the first occurrence of the text following
+        a field. By default ("auto"), the scan engine is used if it gives the same
+        results as the RegEx engine, i.e. if all fields are untyped and unique
+        and no RegEx flags are used. Bytes templates always use the RegEx engine.
+    timeout : float, optional
+        Time budget in seconds for matching a text with the "scan" engine. If the
+        budget is exceeded a ``TimeoutError`` is raised. By default no budget is
+        used. Matching with the RegEx engine can't be interrupted, so a
+        ``ValueError`` is raised if a budget is given and the template uses the
+        RegEx engine.
+    record_type : {"dict", "namedtuple"} or type, optional
+        The type of the parsed data. By default ("dict"), the data is a dictionary
+        of the field keys and values. With "namedtuple" the data is a named tuple
+        of the values, which needs less than half the memory of a dictionary.
+        Indexed fields are named by an underscore and their position, e.g. ``_0``.
+        Any other type, for example a class with ``__slots__``, is called with the
+        values of the fields in order.
 
     Attributes
     ----------
-    template : str
+    template : str or bytes
         The template format string.
+    binary : bool
+        True if the template is a bytes template.
+    engine : str
+        The matching engine used for parsing text, either "regex" or "scan".
+    record_type : str or type
+        The type of the parsed data.
     """
 
     def __init__(
         self,
-        template: str,
+        template: Union[str, bytes],
         *handlers: CustomFormatter,
         ignore_case: bool = False,
         flags: Union[int, re.RegexFlag] = None,
+        engine: str = "auto",
+        timeout: float = None,
+        record_type: Union[str, type] = "dict",
     ):
+        if engine not in ENGINES:
+            raise ValueError(f"Engine {engine} not supported. Valid are: {ENGINES}")
+        start = time.perf_counter()
         self.template = template
+        self.binary = isinstance(template, (bytes, bytearray))
+        if self.binary:
+            if engine == "scan":
+                raise ValueError("Bytes templates only support the regex engine")
+            # Latin-1 maps every byte to the character with the same value
+            template = bytes(template).decode("latin-1")
+        self.timeout = timeout
+        self._text_template = template
         self._fields, self._pattern = _compile_fields(template, ignore_case, flags)
+        self._scanner = None
+        self._strip = str.strip
+        if self.binary:
+            self._pattern = _encode_pattern(self._pattern.pattern, self._pattern.flags)
+            for field in self._fields:
+                field.source = field.source.encode("latin-1")
+            self._strip = _strip_bytes
+        elif engine != "regex":
+            flags = _regex_flags(ignore_case, flags)
+            scanner = _Scanner(template, self._fields, flags)
+            if engine == "scan" or scanner.exact:
+                self._scanner = scanner
+        self.engine = "regex" if self._scanner is None else "scan"
+        _check_timeout(timeout, self.engine)
+        self._timings = None
+        self._hook = None
         self._handlers = dict()
-        if handlers:
-            for handler in handlers:
-                self.add_handler(handler)
+        self._bytes_patterns = dict()
+        self._search_finders = dict()
+        self._finditer_pattern = None
+        self._converters = list()
+        self._plan = tuple()
+        self._format_steps = _compile_format(self._text_template)
+        self._format_plan = None
+        for handler in handlers:
+            self._handlers[handler.key] = handler
+        self._update_plan()
+        self._init_record(record_type)
+        self._init_prefilter()
+        self._compile_time = time.perf_counter() - start
 
     @classmethod
     def from_file(
@@ -417,6 +1406,9 @@ class Template:
         *handlers: CustomFormatter,
         ignore_case: bool = False,
         flags: Union[int, re.RegexFlag] = None,
+        engine: str = "auto",
+        timeout: float = None,
+        record_type: Union[str, type] = "dict",
     ) -> "Template":
         """Create a template from a file.
 
@@ -430,12 +1422,195 @@ class Template:
             Ignore case when matching fields, by default False.
         flags : int or re.RegexFlag, optional
             Additional RegEx flags.
+        engine : {"auto", "regex", "scan"}, optional
+            The matching engine used for parsing text, by default "auto".
+        timeout : float, optional
+            Time budget in seconds for matching a text with the "scan" engine.
+        record_type : {"dict", "namedtuple"} or type, optional
+            The type of the parsed data, by default "dict".
         """
         template_file = Path(template_file)
         if not template_file.exists():
             raise FileNotFoundError(f"Template file {template_file} not found")
         template = template_file.read_text()
-        return cls(template, *handlers, ignore_case=ignore_case, flags=flags)
+        return cls(
+            template,
+            *handlers,
+            ignore_case=ignore_case,
+            flags=flags,
+            engine=engine,
+            timeout=timeout,
+            record_type=record_type,
+        )
+
+    @classmethod
+    def from_cache(
+        cls,
+        template: Union[str, bytes],
+        *handlers: CustomFormatter,
+        ignore_case: bool = False,
+        flags: Union[int, re.RegexFlag] = None,
+        engine: str = "auto",
+        timeout: float = None,
+        record_type: Union[str, type] = "dict",
+        cache_dir: Union[str, Path] = None,
+    ) -> "Template":
+        """Create a template using an on-disk cache of compiled templates.
+
+        The compiled template is stored in the cache directory, keyed by a hash
+        of the template string, the matching options and the source code of this
+        module. Later calls, for example of short-lived scripts or worker
+        processes, load the compiled template instead of compiling the template
+        string again. If the source of the module can't be read, the cache is
+        not used.
+
+        Parameters
+        ----------
+        template : str or bytes
+            The template format string.
+        handlers : CustomFormatter
+            Custom formatters to use when parsing fields. The handlers are not
+            stored in the cache.
+        ignore_case : bool, optional
+            Ignore case when matching fields, by default False.
+        flags : int or re.RegexFlag, optional
+            Additional RegEx flags.
+        engine : {"auto", "regex", "scan"}, optional
+            The matching engine used for parsing text, by default "auto".
+        timeout : float, optional
+            Time budget in seconds for matching a text with the "scan" engine.
+            Raises a ``ValueError`` if the template uses the RegEx engine.
+        record_type : {"dict", "namedtuple"} or type, optional
+            The type of the parsed data, by default "dict".
+        cache_dir : str or Path, optional
+            The cache directory. By default the directory given by the environment
+            variable ``FTMPLT_CACHE_DIR`` or ``~/.cache/ftmplt`` is used.
+        """
+        if cache_dir is None:
+            cache_dir = _default_cache_dir()
+        code_hash = _code_hash()
+        options = (
+            STATE_VERSION,
+            code_hash,
+            template,
+            ignore_case,
+            int(flags or 0),
+            engine,
+        )
+        key = hashlib.sha256(repr(options).encode("utf-8")).hexdigest()
+        file = Path(cache_dir) / f"{key}.tmplt"
+
+        tmplt = None
+        if code_hash is not None:
+            try:
+                tmplt = cls.from_bytes(file.read_bytes())
+            except Exception:
+                # Not cached yet or the cache file is invalid
+                pass
+        if tmplt is None or tmplt.template != template:
+            tmplt = cls(template, ignore_case=ignore_case, flags=flags, engine=engine)
+            if code_hash is not None:
+                try:
+                    file.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = file.with_name(f"{file.name}.{os.getpid()}.tmp")
+                    tmp.write_bytes(tmplt.to_bytes())
+                    os.replace(tmp, file)
+                except OSError:
+                    pass
+        _check_timeout(timeout, tmplt.engine)
+        tmplt.timeout = timeout
+        for handler in handlers:
+            tmplt._handlers[handler.key] = handler
+        if handlers:
+            tmplt._update_plan()
+        tmplt._init_record(record_type)
+        return tmplt
+
+    def to_bytes(self) -> bytes:
+        """Serializes the compiled template.
+
+        The serialized template contains the compiled fields, the sources of the
+        RegEx patterns and the custom handlers, which have to be picklable.
+
+        Returns
+        -------
+        data : bytes
+            The serialized template.
+
+        See Also
+        --------
+        Template.from_bytes: Load a serialized template.
+        """
+        return pickle.dumps(self.__getstate__(), protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Template":
+        """Loads a serialized template without compiling the template string.
+
+        Since the data is unpickled, only load data from trusted sources.
+
+        Parameters
+        ----------
+        data : bytes
+            The serialized template, see ``Template.to_bytes``.
+
+        Returns
+        -------
+        template : Template
+        """
+        state = pickle.loads(data)
+        if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+            raise ValueError("Data is not a serialized template of this version")
+        tmplt = cls.__new__(cls)
+        tmplt.__setstate__(state)
+        return tmplt
+
+    def __getstate__(self) -> Dict[str, Any]:
+        fields = [
+            (f.name, f.spec, f.conv, f.fstr, f.type, f.base, f.source, f.group_name)
+            + (f.flags,)
+            for f in self._fields
+        ]
+        return {
+            "version": STATE_VERSION,
+            "template": self.template,
+            "timeout": self.timeout,
+            "fields": fields,
+            "pattern": (self._pattern.pattern, self._pattern.flags),
+            "scanner": None if self._scanner is None else self._scanner.flags,
+            "format_steps": self._format_steps,
+            "handlers": tuple(self._handlers.values()),
+            "record_type": self.record_type,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        start = time.perf_counter()
+        template = state["template"]
+        self.template = template
+        self.binary = isinstance(template, (bytes, bytearray))
+        if self.binary:
+            template = bytes(template).decode("latin-1")
+        self.timeout = state["timeout"]
+        self._text_template = template
+        self._fields = [FormatField(*values) for values in state["fields"]]
+        self._pattern = re.compile(*state["pattern"])
+        self._strip = _strip_bytes if self.binary else str.strip
+        self._scanner = None
+        if state["scanner"] is not None:
+            self._scanner = _Scanner(template, self._fields, state["scanner"])
+        self.engine = "regex" if self._scanner is None else "scan"
+        self._timings = None
+        self._hook = None
+        self._handlers = {handler.key: handler for handler in state["handlers"]}
+        self._bytes_patterns = dict()
+        self._search_finders = dict()
+        self._finditer_pattern = None
+        self._format_steps = state["format_steps"]
+        self._format_plan = None
+        self._update_plan()
+        self._init_record(state.get("record_type", "dict"))
+        self._init_prefilter()
+        self._compile_time = time.perf_counter() - start
 
     @property
     def fields(self) -> List[FormatField]:
@@ -459,6 +1634,233 @@ class Template:
             Custom format handler.
         """
         self._handlers[handler.key] = handler
+        self._update_plan()
+
+    def _update_plan(self) -> None:
+        """Builds the plan for converting the raw values of the fields.
+
+        The plan contains the output key, the index of the raw value and the
+        converter function (type conversion or custom handler) of each field.
+        """
+        converters, plan = list(), list()
+        for i, field in enumerate(self._fields):
+            key = int(field.name) if field.name.isdigit() else field.name
+            handler = self._handlers.get(key)
+            if handler is None:
+                converter = _get_converter(field, self.binary)
+                type_name = "bytes" if self.binary else "str"
+                if field.type is not None:
+                    type_name = field.type.__name__
+                event = f"convert.{type_name}"
+            else:
+                converter = handler.parse
+                event = "handler.parse"
+            if self._timings is not None:
+                converter = self._timed(converter, event)
+            converters.append(converter)
+            plan.append((key, i, converter))
+        self._converters = converters
+        self._plan = tuple(plan)
+        self._lazy_plan = {key: (i, converter) for key, i, converter in plan}
+
+        if self._format_steps is not None:
+            # Resolve the handlers and conversions of the fields for formatting
+            steps, text_suffix = self._format_steps
+            format_plan = list()
+            for text, key, conversion, spec in steps:
+                funcs = list()
+                if key in self._handlers:
+                    handler_format = self._handlers[key].format
+                    if self._timings is not None:
+                        handler_format = self._timed(handler_format, "handler.format")
+                    funcs.append(handler_format)
+                if self.binary:
+                    funcs.append(_decode_latin1)
+                if conversion is not None:
+                    funcs.append(conversion)
+                prepare = funcs[0] if len(funcs) == 1 else None
+                if len(funcs) > 1:
+                    prepare = functools.partial(_chain, tuple(funcs))
+                format_plan.append((text, key, prepare, spec))
+            self._format_plan = (tuple(format_plan), text_suffix)
+
+    def _init_record(self, record_type: Union[str, type]) -> None:
+        """Initializes the type of the parsed data, see ``record_type``."""
+        if isinstance(record_type, str) and record_type not in RECORD_TYPES:
+            raise ValueError(
+                f"Record type {record_type} not supported. Valid are: {RECORD_TYPES}"
+            )
+        self.record_type = record_type
+        self._record = None
+        if record_type == "namedtuple":
+            self._record = _record_class(tuple(f.name for f in self._fields))
+        elif record_type != "dict":
+            self._record = record_type
+
+    def _init_prefilter(self) -> None:
+        """Initializes the prefilter rejecting texts without the literal text.
+
+        Every matching text starts with the leading literal text, ends with the
+        trailing literal text and contains all literal text between the fields.
+        Checking the leading, trailing and longest interior literal text with
+        string operations rejects most other texts before the RegEx pattern is
+        used. The scan engine already locates the literal text itself.
+        """
+        self._stats = {"prefilter_rejects": 0, "regex_rejects": 0}
+        self._prefilter = None
+        if self._scanner is not None or self._pattern.flags & re.IGNORECASE:
+            return
+        items = _split_template(self._text_template)
+        if not items:
+            return
+        literals = [item[0] for item in items] + [items[-1][5]]
+        if self.binary:
+            literals = [literal.encode("latin-1") for literal in literals]
+        leading, trailing = literals[0], literals[-1]
+        interior = max(literals[1:-1], key=len, default=literals[0][:0])
+        if leading or trailing or interior:
+            self._prefilter = _literal_prefilter(leading, trailing, interior)
+
+    def stats(self, reset: bool = False) -> Dict[str, Union[int, Timing]]:
+        """Returns the statistics of the template.
+
+        Parameters
+        ----------
+        reset : bool, optional
+            If True, the statistics are reset to zero afterwards.
+
+        Returns
+        -------
+        stats : dict[str, int or Timing]
+            The number of texts rejected by the literal prefilter without using
+            the RegEx pattern (``"prefilter_rejects"``) and the number of texts
+            rejected by the RegEx pattern (``"regex_rejects"``). If the template
+            is instrumented, the number of calls and the cumulative time in seconds
+            of each event as ``Timing``, see ``Template.instrument``.
+        """
+        stats = dict(self._stats)
+        if self._timings is not None:
+            for event, (calls, seconds) in self._timings.items():
+                stats[event] = Timing(calls, seconds)
+        if reset:
+            for key in self._stats:
+                self._stats[key] = 0
+            if self._timings is not None:
+                self._timings.clear()
+        return stats
+
+    def instrument(
+        self,
+        enabled: bool = True,
+        hook: Callable[["Template", str, float], None] = None,
+    ) -> None:
+        """Enables or disables the instrumentation of the template.
+
+        The instrumented template counts the calls and measures the cumulative
+        time of each step of parsing and formatting, reported by
+        ``Template.stats``. The events are:
+
+        - ``"compile"``: Compiling (or unpickling) the template.
+        - ``"match"``: Matching a text with the template.
+        - ``"convert.<type>"``: Converting the values of fields of a type, for
+          example ``"convert.int"`` or ``"convert.str"`` for untyped fields.
+        - ``"handler.parse"`` and ``"handler.format"``: Calls of custom formatters.
+        - ``"io.read"`` and ``"io.write"``: Reading and writing files.
+
+        The timed functions are swapped into the template when it is instrumented,
+        so a template without instrumentation doesn't check for it at all. Calls
+        in worker processes of ``Template.parse_files`` aren't recorded and the
+        statistics aren't synchronized between threads.
+
+        Parameters
+        ----------
+        enabled : bool, optional
+            If True (default), the instrumentation is enabled and the statistics
+            are reset. If False, the instrumentation is removed.
+        hook : Callable, optional
+            Function called with the template, the event and the duration in
+            seconds after each timed step, for example to report the timings to a
+            metrics system.
+
+        Examples
+        --------
+        >>> template = Template("My name is {name} and I am {age:d} years old")
+        >>> template.instrument()
+        >>> template.parse("My name is John and I am 42 years old")
+        {'name': 'John', 'age': 42}
+        >>> template.stats()["convert.int"].calls
+        1
+        """
+        for name in ("_match", "_read_file", "_write_file"):
+            # Remove the timed methods of a previous instrumentation
+            self.__dict__.pop(name, None)
+        self._timings = None
+        self._hook = None
+        if enabled:
+            self._timings = {"compile": [1, self._compile_time]}
+            self._hook = hook
+            self._match = self._timed(self._match, "match")
+            self._read_file = self._timed(self._read_file, "io.read")
+            self._write_file = self._timed(self._write_file, "io.write")
+        self._update_plan()
+
+    def _timed(self, func: Callable, event: str) -> Callable:
+        """Wraps a function to record the calls and the duration as event."""
+        perf_counter = time.perf_counter
+        record = self._record_event
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(event, perf_counter() - start)
+
+        return timed
+
+    def _record_event(self, event: str, elapsed: float) -> None:
+        """Records a call of an instrumented step, see ``Template.instrument``."""
+        timings = self._timings
+        if timings is None:
+            return
+        timing = timings.get(event)
+        if timing is None:
+            timings[event] = [1, elapsed]
+        else:
+            timing[0] += 1
+            timing[1] += elapsed
+        if self._hook is not None:
+            self._hook(self, event, elapsed)
+
+    def _match(self, text: str) -> Sequence[str]:
+        """Matches the whole (stripped) text and returns the raw field values."""
+        if self._scanner is not None:
+            deadline = None
+            if self.timeout is not None:
+                deadline = time.perf_counter() + self.timeout
+            values = self._scanner.match(text, deadline)
+            if values is None:
+                raise ParseError("Text does not match the template")
+            return values
+        if self._prefilter is not None and not self._prefilter(text):
+            self._stats["prefilter_rejects"] += 1
+            raise ParseError("Text does not match the template")
+        match = self._pattern.fullmatch(text)
+        if match is None:
+            self._stats["regex_rejects"] += 1
+            raise ParseError("Text does not match the template")
+        return match.groups()
+
+    def _convert(self, values: Sequence[str], lazy: bool = False) -> Data:
+        """Converts the raw values of the fields using the conversion plan."""
+        if lazy:
+            return LazyResult(values, self._lazy_plan)
+        if self._record is not None:
+            return self._record(*[convert(values[i]) for _, i, convert in self._plan])
+        data = dict()
+        for key, i, convert in self._plan:
+            data[key] = convert(values[i])
+        return data
 
     def get_field(self, key: Key) -> FormatField:
         """Gets a field by name or index.
@@ -479,18 +1881,23 @@ class Template:
                 return field
         raise _get_field(self._fields, key)
 
-    def parse(self, text: str) -> Data:
+    def parse(self, text: str, lazy: bool = False) -> Data:
         """Parses text using the template instance.
 
         Parameters
         ----------
         text : str
             The text to parse.
+        lazy : bool, optional
+            If True, a ``LazyResult`` is returned, which converts the value of each
+            field only when it is accessed, regardless of ``record_type``. This
+            saves time if only a few of many fields are used. By default False.
 
         Returns
         -------
         data : dict[str|int, Any]
-            The parsed data as a dictionary.
+            The parsed data as a dictionary, or a record if ``record_type`` is
+            given.
 
         Examples
         --------
@@ -521,25 +1928,12 @@ class Template:
         >>> template.parse("My name is John and I am 42 years old")
         {0: 'John', 'age': 42}
         """
-        text = text.strip()
-        match = self._pattern.match(text)
-        raw_data = match.groupdict()
-        data = dict()
-        # spans = dict()
-        for field in self._fields:
-            # Try to convert to int or float
-            k = field.name
-            if k.isdigit():
-                k = int(k)
-            if k in self._handlers:
-                handler = self._handlers[k]
-                value = handler.parse(raw_data[field.group_name])
-            else:
-                value = _convert_type(field, raw_data[field.group_name])
-            data[k] = value
-            # Get span of field
-            # spans[k] = match.span(field.group_name)
-        return data
+        values = self._match(self._strip(text))
+        if lazy:
+            return LazyResult(values, self._lazy_plan)
+        if self._record is not None:
+            return self._record(*[convert(values[i]) for _, i, convert in self._plan])
+        return {key: convert(values[i]) for key, i, convert in self._plan}
 
     def search(self, text: str, item: Key) -> SearchResult:
         """Searches text for item using the template instance.
@@ -584,20 +1978,153 @@ class Template:
         >>> template.search("My name is John and I am 42 years old", 0)
         ('John', (11, 15))
         """
-        text = text.strip()
-        field = _get_field(self._fields, item)
-        match = field.pattern.search(text)
-        if match is None:
-            raise ValueError(f"Field {item} not found in text")
-        value = match.group(field.group_name)
-        k = field.name
-        if k in self._handlers:
-            handler = self._handlers[k]
-            value = handler.parse(value)
-        else:
-            value = _convert_type(field, value)
-        span = match.span(field.group_name)
-        return value, span
+        text = self._strip(text)
+        field = _get_field(self._fields, item)
+        index = self._fields.index(field)
+        if self._scanner is not None and self._scanner.validators[index] is None:
+            result = self._scanner.search(text, index)
+            if result is None:
+                raise ValueError(f"Field {item} not found in text")
+            value, span = result
+        else:
+            match = field.pattern.search(text)
+            if match is None:
+                raise ValueError(f"Field {item} not found in text")
+            value = match.group(field.group_name)
+            span = match.span(field.group_name)
+        return self._converters[index](value), span
+
+    def search_many(self, text: str, items: Iterable[Key]) -> Dict[Key, SearchResult]:
+        """Searches text for several items.
+
+        Each item is searched for separately, so the results are the same as of
+        ``Template.search`` for each item, but items that are not found are left
+        out instead of raising an error. Fields without literal text before them
+        share a search with a combined pattern, which saves rescanning the text
+        for each of them.
+
+        Parameters
+        ----------
+        text : str
+            The text to parse using the format string.
+        items : Iterable[str or int]
+            The names or indices of the format fields to search for.
+
+        Returns
+        -------
+        results : dict[str|int, tuple[Any, tuple[int, int]]]
+            The value and span of each item found in the text.
+
+        Examples
+        --------
+        >>> template = Template("My name is {name} and I am {age:d} years old")
+        >>> text = "My name is John and I am 42 years old"
+        >>> template.search_many(text, ["name", "age"])
+        {'name': ('John', (11, 15)), 'age': (42, (25, 27))}
+        """
+        items = list(items)
+        indices = [self._fields.index(_get_field(self._fields, item)) for item in items]
+        found = self._search_many(self._strip(text), indices)
+        results = dict()
+        for item, index in zip(items, indices):
+            if index in found:
+                value, span = found[index]
+                results[item] = self._converters[index](value), span
+        return results
+
+    def _search_many(
+        self, text: Union[str, bytes], indices: Iterable[int], encoding: str = None
+    ) -> Dict[int, Tuple[Union[str, bytes], Tuple[int, int]]]:
+        """Finds the first occurrence of several fields.
+
+        The RegEx engine finds patterns starting with literal text with a fast
+        literal search, which is faster than trying several patterns at each
+        position of the text. Fields following literal text are therefore
+        searched with their own pattern, or with the linear scanner if the
+        template uses it. All other fields are searched together: A lookahead
+        alternation of their patterns locates the next position where any of
+        them matches. The fields matching at this position are
+        recorded and the search continues at the same position with the
+        alternation of the fields that are still missing.
+
+        Parameters
+        ----------
+        text : str or bytes
+            The text to search.
+        indices : Iterable[int]
+            The indices of the fields.
+        encoding : str, optional
+            If given, the text is bytes and the bytes versions of the patterns of
+            a str template are used, see ``Template._bytes_pattern``.
+
+        Returns
+        -------
+        found : dict[int, tuple]
+            The raw value and the span of each field found in the text.
+        """
+        found, remaining = dict(), list()
+        scanner = self._scanner if encoding is None else None
+        for index in sorted(set(indices)):
+            if scanner is not None and scanner.validators[index] is None:
+                result = scanner.search(text, index)
+                if result is not None:
+                    found[index] = result
+                continue
+            field = self._fields[index]
+            pattern = field.pattern
+            if encoding is not None:
+                pattern = self._bytes_pattern(field.source, encoding)
+            if pattern.pattern[:4] in ("(?P<", b"(?P<"):
+                # No literal text before the field
+                remaining.append(index)
+                continue
+            match = pattern.search(text)
+            if match is not None:
+                group = field.group_name
+                found[index] = match.group(group), match.span(group)
+
+        pos = 0
+        while remaining:
+            finder = self._search_finder(tuple(remaining), encoding)
+            match = finder(text, pos)
+            if match is None:
+                break
+            pos = match.start()
+            num_remaining = len(remaining)
+            for index in list(remaining):
+                field = self._fields[index]
+                pattern = field.pattern
+                if encoding is not None:
+                    pattern = self._bytes_pattern(field.source, encoding)
+                match = pattern.match(text, pos)
+                if match is not None:
+                    group = field.group_name
+                    found[index] = match.group(group), match.span(group)
+                    remaining.remove(index)
+            if len(remaining) == num_remaining:
+                # Safeguard, one of the fields always matches at the position
+                pos += 1
+        return found
+
+    def _search_finder(
+        self, indices: Tuple[int, ...], encoding: str = None
+    ) -> Callable[[str, int], Optional[re.Match]]:
+        """Returns the search function of the lookahead alternation of fields."""
+        key = (indices, encoding)
+        finder = self._search_finders.get(key)
+        if finder is None:
+            sources = [self._fields[i].source for i in indices]
+            if isinstance(sources[0], bytes):
+                sources = [source.decode("latin-1") for source in sources]
+            source = "(?=" + "|".join(sources) + ")"
+            if encoding is not None:
+                finder = self._bytes_pattern(source, encoding).search
+            elif self.binary:
+                finder = _encode_pattern(source, self._fields[0].flags).search
+            else:
+                finder = re.compile(source, flags=self._fields[0].flags).search
+            self._search_finders[key] = finder
+        return finder
 
     def format(self, *args, **kwargs) -> str:
         """Formats data using the template instance.
@@ -640,22 +2167,612 @@ class Template:
         >>> template.format({0: "John", "age": 42})
         'My name is John and I am 42 years old'
         """
+        if self._format_plan is not None:
+            if not kwargs and len(args) == 1 and isinstance(args[0], dict):
+                # The data is only read, no need to copy it
+                data = args[0]
+            else:
+                data = dict(*args, **kwargs) if args else kwargs
+            return self._format(data)
+
         data = dict(*args, **kwargs)
         for key, value in data.items():
             if key in self._handlers:
                 handler = self._handlers[key]
                 value = handler.format(value)
                 data[key] = value
+        if self.binary:
+            for key, value in data.items():
+                if isinstance(value, (bytes, bytearray, memoryview)):
+                    data[key] = bytes(value).decode("latin-1")
+            args, kwargs = _split_data(data)
+            return self._text_template.format(*args, **kwargs).encode("latin-1")
         args, kwargs = _split_data(data)
-        return self.template.format(*args, **kwargs)
+        return self._text_template.format(*args, **kwargs)
+
+    def _format(self, data: Data) -> Union[str, bytes]:
+        """Formats data using the compiled format plan."""
+        steps, text_suffix = self._format_plan
+        format_value = builtins.format
+        parts = list()
+        append = parts.append
+        try:
+            for text, key, prepare, spec in steps:
+                value = data[key]
+                if prepare is not None:
+                    value = prepare(value)
+                append(text)
+                append(format_value(value, spec))
+        except KeyError:
+            if isinstance(key, int) and key not in data:
+                raise IndexError(
+                    f"Replacement index {key} out of range for positional args tuple"
+                ) from None
+            raise
+        append(text_suffix)
+        text = "".join(parts)
+        return text.encode("latin-1") if self.binary else text
+
+    def format_many(self, records: Iterable[Mapping[Key, Any]]) -> Iterator[str]:
+        """Formats many records using the template instance.
+
+        Parameters
+        ----------
+        records : Iterable[Mapping[str|int, Any]]
+            The data of each text to format.
+
+        Yields
+        ------
+        text : str
+            The formatted text of each record.
+
+        Examples
+        --------
+        >>> template = Template("My name is {name} and I am {age:d} years old")
+        >>> records = [{"name": "John", "age": 42}, {"name": "Jane", "age": 37}]
+        >>> for text in template.format_many(records):
+        ...     print(text)
+        My name is John and I am 42 years old
+        My name is Jane and I am 37 years old
+        """
+        fmt = self.format if self._format_plan is None else self._format
+        for record in records:
+            yield fmt(record)
+
+    def format_to(
+        self,
+        file: Union[str, Path, IO],
+        records: Iterable[Mapping[Key, Any]],
+        separator: str = None,
+        buffer_size: int = 1 << 20,
+    ) -> int:
+        """Formats many records and writes the texts to a file.
+
+        The formatted texts are collected and written in large blocks, so neither
+        the whole output is built in memory nor is each text written separately.
+
+        Parameters
+        ----------
+        file : str or pathlib.Path or file object
+            The path of the file or a writable file object. A path is opened for
+            writing, an existing file is overwritten.
+        records : Iterable[Mapping[str|int, Any]]
+            The data of each text to format.
+        separator : str, optional
+            The text written between two records, by default a newline.
+        buffer_size : int, optional
+            The number of characters that are collected before they are written,
+            by default 1M.
+
+        Returns
+        -------
+        count : int
+            The number of written records.
+
+        Examples
+        --------
+        >>> template = Template("x={x:.2f} y={y:.2f}")
+        >>> records = ({"x": i, "y": i**2} for i in range(1000))
+        >>> template.format_to("sweep.txt", records)
+        1000
+        """
+        if separator is None:
+            separator = b"\n" if self.binary else "\n"
+        if isinstance(file, (str, Path)):
+            mode = "wb" if self.binary else "w"
+            with open(file, mode) as fh:
+                return self.format_to(fh, records, separator, buffer_size)
+
+        empty = b"" if self.binary else ""
+        write = file.write
+        parts, size, count = list(), 0, 0
+        for text in self.format_many(records):
+            if count:
+                parts.append(separator)
+            parts.append(text)
+            size += len(text)
+            count += 1
+            if size >= buffer_size:
+                write(empty.join(parts))
+                parts, size = list(), 0
+        if parts:
+            write(empty.join(parts))
+        return count
+
+    def finditer(self, text: str) -> Iterator[Tuple[Data, Tuple[int, int]]]:
+        """Finds all non-overlapping occurrences of the template in a text.
+
+        The text is scanned once from left to right. Note that an untyped field
+        at the end of the template matches an empty string, since there is no
+        literal text terminating the field. A datetime field at the end of the
+        template only matches zero-padded values of the numeric directives
+        ``%Y``, ``%m``, ``%d``, ``%H``, ``%M``, ``%S`` and ``%f``, other
+        directives raise a ``ValueError``.
+
+        Parameters
+        ----------
+        text : str
+            The text to search.
+
+        Yields
+        ------
+        data : dict[str|int, Any]
+            The parsed data of the occurrence as a dictionary.
+        span : tuple[int, int]
+            The span of the occurrence in the text.
+
+        Examples
+        --------
+        >>> template = Template("Iteration {it:d}: E={energy:f}")
+        >>> text = "Iteration 1: E=-1.5\\nIteration 2: E=-1.6\\n"
+        >>> for data, span in template.finditer(text):
+        ...     print(data, span)
+        {'it': 1, 'energy': -1.5} (0, 19)
+        {'it': 2, 'energy': -1.6} (20, 39)
+        """
+        convert = self._convert
+        for match in self._find_pattern().finditer(text):
+            yield convert(match.groups()), match.span()
+
+    def findall(self, text: str) -> List[Data]:
+        """Parses all non-overlapping occurrences of the template in a text.
+
+        Parameters
+        ----------
+        text : str
+            The text to search.
+
+        Returns
+        -------
+        data : list[dict[str|int, Any]]
+            The parsed data of all occurrences.
+
+        See Also
+        --------
+        Template.finditer: Iterate over all occurrences and their spans.
+        """
+        return [data for data, _ in self.finditer(text)]
+
+    def _find_pattern(self) -> re.Pattern:
+        """Returns the pattern for finding the occurrences of the template.
+
+        Without literal text after it, the lazy pattern of a field at the end of
+        the template matches an empty string. This is converted to an empty string
+        for untyped fields, but isn't a valid datetime. Datetime fields at the end
+        of the template are therefore matched with the pattern of their
+        zero-padded values.
+        """
+        if self._finditer_pattern is not None:
+            return self._finditer_pattern
+        pattern = self._pattern
+        items = _split_template(self._text_template) if self._fields else []
+        if items and not items[-1][5]:
+            _, name, spec, _, group_name, _, _ = items[-1]
+            source = pattern.pattern
+            if self.binary:
+                source = source.decode("latin-1")
+            group = f"(?P<{group_name}>{PATTERN_ANY})"
+            type_, _ = _format_type(spec)
+            if (
+                type_ is datetime
+                and name not in self._handlers
+                and source.endswith(group)
+            ):
+                compiled = _datetime_pattern(spec, capture=False)
+                if compiled is None:
+                    raise ValueError(
+                        f"Datetime field {name} at the end of the template can "
+                        f"only be found with numeric directives, got {spec}"
+                    )
+                source = source[: -len(group)] + f"(?P<{group_name}>{compiled[0]})"
+                if self.binary:
+                    pattern = _encode_pattern(source, pattern.flags)
+                else:
+                    pattern = re.compile(source, flags=pattern.flags)
+        self._finditer_pattern = pattern
+        return pattern
+
+    def parse_many(
+        self, texts: Iterable[str], *, on_error: str = "raise", lazy: bool = False
+    ) -> Iterator[Union[Data, ParseError]]:
+        """Parses many texts using the template instance.
+
+        Parameters
+        ----------
+        texts : Iterable[str]
+            The texts to parse.
+        on_error : {"raise", "skip", "collect"}, optional
+            How to handle texts that can not be parsed. If "raise" (default), a
+            ``ParseError`` is raised. If "skip", the text is skipped. If "collect",
+            the ``ParseError`` is yielded instead of the parsed data. The original
+            exception is available as ``__cause__`` of the error.
+        lazy : bool, optional
+            If True, the fields are converted on first access, see
+            ``Template.parse``. Errors converting a value are then raised on
+            access instead of being handled according to `on_error`.
+            By default False.
+
+        Yields
+        ------
+        data : dict[str|int, Any] or ParseError
+            The parsed data of each text as a dictionary.
+
+        Examples
+        --------
+        >>> template = Template("My name is {name} and I am {age:d} years old")
+        >>> texts = [
+        ...     "My name is John and I am 42 years old",
+        ...     "My name is Jane and I am forty years old",
+        ... ]
+        >>> list(template.parse_many(texts, on_error="skip"))
+        [{'name': 'John', 'age': 42}]
+        >>> results = list(template.parse_many(texts, on_error="collect"))
+        >>> results[1]
+        ParseError('Text 1: Text does not match the template')
+        """
+        if on_error not in ON_ERROR:
+            raise ValueError(f"Invalid value {on_error} of on_error: use {ON_ERROR}")
+        # Bind everything used in the loop once for the whole batch
+        plan, record = self._plan, self._record
+        lazy_plan = self._lazy_plan if lazy else None
+        scan = None
+        if self._scanner is not None or self._timings is not None:
+            scan = self._match
+        pattern_match = self._pattern.fullmatch
+        strip, prefilter, stats = self._strip, self._prefilter, self._stats
+        for index, text in enumerate(texts):
+            try:
+                if scan is None:
+                    stripped = strip(text)
+                    if prefilter is not None and not prefilter(stripped):
+                        stats["prefilter_rejects"] += 1
+                        raise ParseError("Text does not match the template")
+                    match = pattern_match(stripped)
+                    if match is None:
+                        stats["regex_rejects"] += 1
+                        raise ParseError("Text does not match the template")
+                    values = match.groups()
+                else:
+                    values = scan(strip(text))
+                if lazy_plan is not None:
+                    data = LazyResult(values, lazy_plan)
+                elif record is None:
+                    data = dict()
+                    for key, i, convert in plan:
+                        data[key] = convert(values[i])
+                else:
+                    data = record(*[convert(values[i]) for _, i, convert in plan])
+            except Exception as e:
+                if on_error == "skip":
+                    continue
+                error = ParseError(f"Text {index}: {e}", index, text)
+                if on_error == "raise":
+                    raise error from e
+                error.__cause__ = e
+                data = error
+            yield data
+
+    def parse_columns(
+        self,
+        texts: Iterable[str],
+        *,
+        on_error: str = "raise",
+        as_numpy: bool = None,
+        chunk_size: int = 65536,
+    ) -> Dict[Key, Column]:
+        """Parses many texts using the template instance and returns the columns.
+
+        Instead of a dictionary per text, the values of each field are collected
+        in a column. Integer and float fields are stored in compact
+        ``array.array`` buffers (or NumPy arrays), all other fields in lists.
+        The texts are matched in chunks and the raw values of each chunk are
+        converted column by column in bulk.
+
+        Parameters
+        ----------
+        texts : Iterable[str]
+            The texts to parse.
+        on_error : {"raise", "skip"}, optional
+            How to handle texts that can not be parsed. If "raise" (default), a
+            ``ParseError`` is raised. If "skip", the text is skipped.
+        as_numpy : bool, optional
+            If True, integer and float columns are returned as NumPy arrays. By
+            default NumPy arrays are used if NumPy is installed.
+        chunk_size : int, optional
+            Number of texts that are matched before their values are converted,
+            by default 65536.
+
+        Returns
+        -------
+        columns : dict[str|int, array.array or numpy.ndarray or list]
+            The parsed values of each field.
+
+        Examples
+        --------
+        >>> template = Template("My name is {name} and I am {age:d} years old")
+        >>> texts = [
+        ...     "My name is John and I am 42 years old",
+        ...     "My name is Jane and I am 37 years old",
+        ... ]
+        >>> template.parse_columns(texts, as_numpy=False)
+        {'name': ['John', 'Jane'], 'age': array('q', [42, 37])}
+        """
+        if on_error not in ("raise", "skip"):
+            raise ValueError(f"Invalid value {on_error} of on_error: use raise, skip")
+        if as_numpy is None:
+            as_numpy = np is not None
+        elif as_numpy and np is None:
+            raise ImportError("NumPy is required for returning NumPy arrays")
+
+        match, strip = self._match, self._strip
+        columns = [self._new_column(i) for _, i, _ in self._plan]
+        rows, indices = list(), list()
+        for index, text in enumerate(texts):
+            try:
+                rows.append(match(strip(text)))
+            except ParseError as e:
+                if on_error == "skip":
+                    continue
+                raise ParseError(f"Text {index}: {e}", index, text) from e
+            indices.append(index)
+            if len(rows) >= chunk_size:
+                self._extend_columns(columns, rows, indices, on_error)
+                rows, indices = list(), list()
+        if rows:
+            self._extend_columns(columns, rows, indices, on_error)
+
+        if as_numpy:
+            for j, column in enumerate(columns):
+                if isinstance(column, array.array):
+                    columns[j] = _to_ndarray(column)
+        return dict(zip([key for key, _, _ in self._plan], columns))
+
+    def _new_column(self, index: int) -> Column:
+        """Returns an empty column for the values of a field."""
+        field = self._fields[index]
+        key = int(field.name) if field.name.isdigit() else field.name
+        if key not in self._handlers:
+            if field.type is int:
+                return array.array("q")
+            if field.type is float:
+                return array.array("d")
+        return list()
+
+    def _extend_columns(
+        self,
+        columns: List[Column],
+        rows: List[Sequence[str]],
+        indices: List[int],
+        on_error: str,
+    ) -> None:
+        """Converts a chunk of raw field values and appends them to the columns.
+
+        Parameters
+        ----------
+        columns : list[array.array or list]
+            The columns of the fields.
+        rows : list[Sequence[str]]
+            The raw values of the fields of each matched text.
+        indices : list[int]
+            The indices of the matched texts.
+        on_error : {"raise", "skip"}
+            How to handle values that can not be converted.
+        """
+        chunks, invalid = list(), dict()
+        for j, raws in enumerate(zip(*rows)):
+            convert = self._converters[j]
+            typecode = getattr(columns[j], "typecode", None)
+            try:
+                chunks.append(_convert_column(convert, raws, typecode))
+            except Exception:
+                for k, value in enumerate(raws):
+                    try:
+                        convert(value)
+                    except Exception as e:
+                        invalid.setdefault(k, e)
+
+        if invalid:
+            if on_error == "raise":
+                k = min(invalid)
+                index = indices[k]
+                raise ParseError(f"Text {index}: {invalid[k]}", index) from invalid[k]
+            rows = [row for k, row in enumerate(rows) if k not in invalid]
+            indices = [i for k, i in enumerate(indices) if k not in invalid]
+            return self._extend_columns(columns, rows, indices, on_error)
+
+        for j, chunk in enumerate(chunks):
+            if isinstance(columns[j], array.array) and isinstance(chunk, list):
+                # Integer too large for a 64-bit buffer, fall back to list
+                columns[j] = columns[j].tolist()
+            columns[j].extend(chunk)
+
+    def iter_file(
+        self,
+        file: Union[str, Path],
+        chunk_size: int = 1 << 20,
+        encoding: str = None,
+        max_length: int = 1 << 16,
+    ) -> Iterator[Tuple[Data, Tuple[int, int]]]:
+        """Finds all occurrences of the template in a file without loading it.
+
+        The file is read in chunks. Text that might be the start of an occurrence
+        is carried over to the next chunk, at most the last `max_length`
+        characters, so the memory usage is bounded by the chunk size plus
+        `max_length`. If the template starts with literal text, text that can't
+        be the start of an occurrence is dropped early. If the template ends with
+        a field, the last occurrence in the carried text is matched again after
+        the next chunk is read, since a number might continue in the next chunk.
+
+        Parameters
+        ----------
+        file : str or pathlib.Path
+            The path of the file.
+        chunk_size : int, optional
+            The number of characters (bytes for bytes templates) read at once, by
+            default 1M.
+        encoding : str, optional
+            The encoding of the file, by default the platform default encoding.
+            Bytes templates read the file in binary mode.
+        max_length : int, optional
+            The maximal length of an occurrence in characters (bytes for bytes
+            templates). Longer occurrences that span more than one chunk are not
+            found. Since every chunk is searched together with the carried text,
+            large values slow down the search with small chunks. By default 64K.
+
+        Yields
+        ------
+        data : dict[str|int, Any]
+            The parsed data of the occurrence as a dictionary.
+        span : tuple[int, int]
+            The span of the occurrence as character (or byte) offsets in the file.
+
+        See Also
+        --------
+        Template.finditer: Find all occurrences of the template in a text.
+        """
+        pattern, convert = self._find_pattern(), self._convert
+        items = _split_template(self._text_template) if self._fields else []
+        leading = items[0][0] if items else ""
+        # Every occurrence contains the first literal text of the template
+        literals = [item[0] for item in items] + [items[-1][5] if items else ""]
+        literal = next((text for text in literals if text), "")
+        find_leading = find_literal = None
+        if literal:
+            escaped, flags = re.escape(literal), self._pattern.flags
+            if self.binary:
+                find_literal = _encode_pattern(escaped, flags).search
+                literal = literal.encode("latin-1")
+            else:
+                find_literal = re.compile(escaped, flags).search
+            if leading:
+                find_leading, leading = find_literal, literal
+        # Templates starting with an untyped field only match at the current position
+        anchored = False
+        if items and not leading:
+            group = f"(?P<{items[0][4]}>{PATTERN_ANY})"
+            if self.binary:
+                group = group.encode("latin-1")
+            anchored = pattern.pattern.startswith(group)
+        finditer = functools.partial(_match_iter, pattern) if anchored else None
+        if finditer is None:
+            finditer = pattern.finditer
+        # A trailing field, e.g. a number, might continue in the next chunk
+        open_end = bool(items) and not items[-1][5]
+
+        if self.binary:
+            buffer, offset = b"", 0
+            fh = open(file, "rb")
+        else:
+            buffer, offset = "", 0
+            fh = open(file, encoding=encoding)
+        with fh:
+            eof = False
+            # Position in the buffer before which the literal text doesn't start
+            checked = 0
+            while not eof:
+                chunk = fh.read(chunk_size)
+                eof = not chunk
+                buffer += chunk
+                pos = 0
+                matches = iter(())
+                if find_literal is None or find_literal(buffer, checked) is not None:
+                    matches = finditer(buffer)
+                else:
+                    # Without the literal text the RegEx can't match, don't run it
+                    checked = max(0, len(buffer) - len(literal) + 1)
+                # Start of the occurrence that has to be matched again, at most
+                # `max_length` characters before its end
+                held = None
+                match = next(matches, None)
+                while match is not None:
+                    next_match = next(matches, None)
+                    start, end = match.span()
+                    if not eof and (
+                        end >= len(buffer)
+                        or open_end
+                        and next_match is None
+                        and len(buffer) - end < max_length
+                    ):
+                        # The occurrence might continue in the next chunk, match
+                        # it again when more text is read
+                        held = max(start, end - max_length)
+                        break
+                    yield convert(match.groups()), (offset + start, offset + end)
+                    pos = end
+                    match = next_match
+                if find_leading is not None:
+                    # Occurrences can only start with the leading literal text
+                    match = find_leading(buffer, pos)
+                    if match is not None:
+                        pos = match.start()
+                    else:
+                        pos = max(pos, len(buffer) - len(leading) + 1)
+                # Text before the last `max_length` characters can only start
+                # occurrences longer than `max_length`
+                limit = len(buffer) - max_length
+                if held is not None:
+                    limit = min(limit, held)
+                pos = max(pos, limit)
+                buffer = buffer[pos:]
+                offset += pos
+                checked = max(0, checked - pos)
+
+    def _read_file(self, file: Path, encoding: str = None) -> Union[str, bytes]:
+        """Reads the contents of a file, as bytes for bytes templates."""
+        if self.binary:
+            return file.read_bytes()
+        return file.read_text(encoding=encoding)
+
+    def _write_file(self, file: Path, text: Union[str, bytes]) -> None:
+        """Writes the formatted text to a file."""
+        if self.binary:
+            file.write_bytes(text)
+        else:
+            file.write_text(text)
 
-    def parse_file(self, file: Union[str, Path]) -> Data:
+    def parse_file(
+        self,
+        file: Union[str, Path],
+        mmap: bool = False,
+        encoding: str = None,
+        lazy: bool = False,
+    ) -> Data:
         """Parses the contents of a file using the template instance.
 
         Parameters
         ----------
         file : str or pathlib.Path
             The path of the file to parse.
+        mmap : bool, optional
+            If True, the file is memory-mapped and matched with a bytes version of
+            the template pattern. Only the values of the fields are decoded. This
+            requires an ASCII-compatible encoding. By default False.
+        encoding : str, optional
+            The encoding of the file. By default the platform default encoding is
+            used, or UTF-8 if `mmap` is True. Bytes templates don't decode the file.
+        lazy : bool, optional
+            If True, the fields are converted on first access, see
+            ``Template.parse``. By default False.
 
         Returns
         -------
@@ -671,10 +2788,135 @@ class Template:
         {'name': 'John', 'age': 42}
         """
         file = Path(file)
-        text = file.read_text()
-        return self.parse(text)
+        if not mmap:
+            return self.parse(self._read_file(file, encoding), lazy)
+
+        if self.binary:
+            with _map_file(file) as buffer:
+                start, end = _strip_bounds(buffer)
+                match = self._pattern.fullmatch(buffer, start, end)
+                if match is None:
+                    raise ParseError("Text does not match the template")
+                values = match.groups()
+            return self._convert(values, lazy)
+
+        encoding = encoding or "utf-8"
+        # Leading and trailing whitespace is matched instead of stripping the text
+        source = r"\s*(?:" + self._pattern.pattern + r")\s*"
+        pattern = self._bytes_pattern(source, encoding)
+        with _map_file(file) as buffer:
+            match = pattern.fullmatch(buffer)
+            if match is None:
+                raise ParseError("Text does not match the template")
+            values = [value.decode(encoding) for value in match.groups()]
+        return self._convert(values, lazy)
+
+    def parse_files(
+        self,
+        files: Iterable[Union[str, Path]],
+        *,
+        workers: int = None,
+        executor: str = "process",
+        ordered: bool = True,
+        chunk_size: int = None,
+        on_error: str = "raise",
+        mmap: bool = False,
+        encoding: str = None,
+    ) -> Iterator[Tuple[Union[str, Path], Union[Data, ParseError]]]:
+        """Parses the contents of many files in parallel.
+
+        The files are dispatched to a pool of workers in chunks. For a process
+        pool, the template is sent to each worker once when the worker starts.
+
+        Parameters
+        ----------
+        files : Iterable[str or pathlib.Path]
+            The paths of the files to parse.
+        workers : int, optional
+            The number of workers, by default the number of CPUs. If 1, the files
+            are parsed in the current process without a pool.
+        executor : {"process", "thread"}, optional
+            The type of the worker pool, by default "process". Custom handlers
+            have to be picklable to be used with a process pool.
+        ordered : bool, optional
+            If True (default), the results are yielded in the order of the files.
+            Otherwise, the results are yielded as soon as a chunk is completed.
+        chunk_size : int, optional
+            The number of files sent to a worker at once. By default, the files
+            are split into about four chunks per worker, with at most 256 files
+            per chunk.
+        on_error : {"raise", "skip", "collect"}, optional
+            How to handle files that can not be read or parsed. If "raise"
+            (default), a ``ParseError`` is raised. If "skip", the file is
+            skipped. If "collect", the ``ParseError`` is yielded instead of the
+            parsed data.
+        mmap : bool, optional
+            If True, the files are memory-mapped, see ``Template.parse_file``.
+        encoding : str, optional
+            The encoding of the files, see ``Template.parse_file``.
+
+        Yields
+        ------
+        file : str or pathlib.Path
+            The path of the file as given.
+        data : dict[str|int, Any] or ParseError
+            The parsed data of the file as a dictionary.
 
-    def search_file(self, file: Union[str, Path], item: Key) -> SearchResult:
+        Examples
+        --------
+        >>> template = Template("N={n:d} E={energy:f}")
+        >>> files = [f"run{i}/output.txt" for i in range(1000)]
+        >>> for file, data in template.parse_files(files, workers=8):
+        ...     print(file, data["energy"])
+        """
+        if on_error not in ON_ERROR:
+            raise ValueError(f"Invalid value {on_error} of on_error: use {ON_ERROR}")
+        if executor not in EXECUTORS:
+            raise ValueError(f"Executor {executor} not supported: use {EXECUTORS}")
+        files = list(files)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = min(256, max(1, len(files) // (4 * workers)))
+        indexed = list(enumerate(files))
+        chunks = [
+            indexed[i : i + chunk_size] for i in range(0, len(indexed), chunk_size)
+        ]
+
+        if workers == 1:
+            results = (_parse_chunk(self, chunk, mmap, encoding) for chunk in chunks)
+            yield from _file_results(files, results, on_error)
+            return
+
+        if executor == "process":
+            pool = concurrent.futures.ProcessPoolExecutor(
+                workers, initializer=_init_worker, initargs=(self, mmap, encoding)
+            )
+            task = _parse_chunk_worker
+        else:
+            pool = concurrent.futures.ThreadPoolExecutor(workers)
+            task = functools.partial(_parse_chunk, self, mmap=mmap, encoding=encoding)
+        with pool:
+            futures = [pool.submit(task, chunk) for chunk in chunks]
+            try:
+                if ordered:
+                    results = (future.result() for future in futures)
+                else:
+                    completed = concurrent.futures.as_completed(futures)
+                    results = (future.result() for future in completed)
+                yield from _file_results(files, results, on_error)
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def search_file(
+        self,
+        file: Union[str, Path],
+        item: Key,
+        mmap: bool = False,
+        encoding: str = None,
+        char_offsets: bool = False,
+    ) -> SearchResult:
         """Searches the contents of a file for item using the template instance.
 
         Parameters
@@ -683,13 +2925,25 @@ class Template:
             The path of the file.
         item : str or int
             Name or index of field.
+        mmap : bool, optional
+            If True, the file is memory-mapped and searched with a bytes version of
+            the field pattern. Only the value of the field is decoded. This
+            requires an ASCII-compatible encoding. By default False.
+        encoding : str, optional
+            The encoding of the file. By default the platform default encoding is
+            used, or UTF-8 if `mmap` is True. Bytes templates don't decode the file.
+        char_offsets : bool, optional
+            If True and `mmap` is True, the span is converted from byte offsets to
+            character offsets. This decodes the file up to the field. Ignored for
+            bytes templates.
 
         Returns
         -------
         value : Any
             Value of field.
         span : tuple[int, int]
-            Span of field in text.
+            Span of field in text. If `mmap` is True, the span are the byte (or
+            character) offsets in the file.
 
         Examples
         --------
@@ -698,8 +2952,116 @@ class Template:
         ('John', (11, 15))
         """
         file = Path(file)
-        text = file.read_text()
-        return self.search(item, text)
+        if not mmap:
+            return self.search(self._read_file(file, encoding), item)
+
+        encoding = encoding or "utf-8"
+        field = _get_field(self._fields, item)
+        if self.binary:
+            pattern = field.pattern
+        else:
+            pattern = self._bytes_pattern(field.source, encoding)
+        with _map_file(file) as buffer:
+            match = pattern.search(buffer)
+            if match is None:
+                raise ValueError(f"Field {item} not found in text")
+            value = match.group(field.group_name)
+            start, end = match.span(field.group_name)
+            if not self.binary:
+                value = value.decode(encoding)
+            if char_offsets and not self.binary:
+                start = len(buffer[:start].decode(encoding))
+                end = start + len(value)
+        converter = self._converters[self._fields.index(field)]
+        return converter(value), (start, end)
+
+    def search_file_many(
+        self,
+        file: Union[str, Path],
+        items: Iterable[Key],
+        mmap: bool = False,
+        encoding: str = None,
+        char_offsets: bool = False,
+    ) -> Dict[Key, SearchResult]:
+        """Searches the contents of a file for several items.
+
+        The file is read (or memory-mapped) only once, and each item is then
+        searched for in its contents like with ``Template.search_many``.
+
+        Parameters
+        ----------
+        file : str or pathlib.Path
+            The path of the file.
+        items : Iterable[str or int]
+            The names or indices of the format fields to search for.
+        mmap : bool, optional
+            If True, the file is memory-mapped, see ``Template.search_file``.
+        encoding : str, optional
+            The encoding of the file, see ``Template.search_file``.
+        char_offsets : bool, optional
+            If True and `mmap` is True, the spans are converted from byte offsets
+            to character offsets, see ``Template.search_file``.
+
+        Returns
+        -------
+        results : dict[str|int, tuple[Any, tuple[int, int]]]
+            The value and span of each item found in the file.
+
+        See Also
+        --------
+        Template.search_many: Search text for several items.
+        """
+        file = Path(file)
+        if not mmap:
+            return self.search_many(self._read_file(file, encoding), items)
+
+        encoding = encoding or "utf-8"
+        items = list(items)
+        indices = [self._fields.index(_get_field(self._fields, item)) for item in items]
+        with _map_file(file) as buffer:
+            if self.binary:
+                found = self._search_many(buffer, indices)
+            else:
+                found = self._search_many(buffer, indices, encoding)
+                offset, num_chars = 0, 0
+                for index, (value, (start, end)) in sorted(
+                    found.items(), key=lambda x: x[1][1]
+                ):
+                    value = value.decode(encoding)
+                    if char_offsets:
+                        # Decode the file incrementally up to each field
+                        num_chars += len(buffer[offset:start].decode(encoding))
+                        offset = start
+                        start, end = num_chars, num_chars + len(value)
+                    found[index] = value, (start, end)
+        results = dict()
+        for item, index in zip(items, indices):
+            if index in found:
+                value, span = found[index]
+                results[item] = self._converters[index](value), span
+        return results
+
+    def _bytes_pattern(self, source: str, encoding: str) -> re.Pattern:
+        """Returns the bytes version of a pattern of the template.
+
+        Parameters
+        ----------
+        source : str
+            The source of the RegEx pattern.
+        encoding : str
+            The encoding used to encode the literal text in the pattern.
+
+        Returns
+        -------
+        pattern : re.Pattern
+            The compiled bytes pattern. The patterns are cached on the instance.
+        """
+        key = (source, encoding)
+        pattern = self._bytes_patterns.get(key)
+        if pattern is None:
+            pattern = _encode_pattern(source, self._pattern.flags, encoding)
+            self._bytes_patterns[key] = pattern
+        return pattern
 
     def format_file(self, file: Union[str, Path], *args, **kwargs) -> None:
         """Formats data using a template string and writes the text to a file.
@@ -720,9 +3082,525 @@ class Template:
         >>> template = Template("My name is {name} and I am {age:d} years old")
         >>> template.format_file("data.txt", {"name": "John", "age": 42})
         """
-        file = Path(file)
         text = self.format(*args, **kwargs)
-        file.write_text(text)
+        self._write_file(Path(file), text)
+
+    async def aparse_file(
+        self,
+        file: Union[str, Path],
+        *,
+        mmap: bool = False,
+        encoding: str = None,
+        parse_in_executor: bool = False,
+        executor: concurrent.futures.Executor = None,
+    ) -> Data:
+        """Parses the contents of a file without blocking the event loop.
+
+        The file is read in an executor and parsed in the event loop.
+
+        Parameters
+        ----------
+        file : str or pathlib.Path
+            The path of the file to parse.
+        mmap : bool, optional
+            If True, the file is memory-mapped, see ``Template.parse_file``. The
+            file is then also parsed in the executor.
+        encoding : str, optional
+            The encoding of the file, see ``Template.parse_file``.
+        parse_in_executor : bool, optional
+            If True, the file is also parsed in the executor. Use this for large
+            files, whose parsing would block the event loop. By default False.
+        executor : concurrent.futures.Executor, optional
+            The executor used for reading the file, by default the default
+            executor of the event loop.
+
+        Returns
+        -------
+        data : dict[str|int, Any]
+            Parsed data as a dictionary.
+
+        Examples
+        --------
+        >>> template = Template("My name is {name} and I am {age:d} years old")
+        >>> await template.aparse_file("data.txt")
+        {'name': 'John', 'age': 42}
+        """
+        loop = asyncio.get_running_loop()
+        if parse_in_executor or mmap:
+            func = functools.partial(
+                self.parse_file, file, mmap=mmap, encoding=encoding
+            )
+            return await loop.run_in_executor(executor, func)
+        func = functools.partial(self._read_file, Path(file), encoding)
+        text = await loop.run_in_executor(executor, func)
+        return self.parse(text)
+
+    async def aformat_file(self, file: Union[str, Path], *args, **kwargs) -> None:
+        """Formats data and writes the text to a file without blocking the event loop.
+
+        The data is formatted in the event loop and the file is written in the
+        default executor of the event loop.
+
+        Parameters
+        ----------
+        file : str or pathlib.Path
+            The path of the file.
+        *args
+            Positional data to format using the format string.
+        **kwargs
+            keyword data to format using the format string.
+
+        Examples
+        --------
+        >>> template = Template("My name is {name} and I am {age:d} years old")
+        >>> await template.aformat_file("data.txt", {"name": "John", "age": 42})
+        """
+        text = self.format(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write_file, Path(file), text)
+
+    async def aparse_files(
+        self,
+        files: Iterable[Union[str, Path]],
+        *,
+        limit: int = 64,
+        ordered: bool = True,
+        on_error: str = "raise",
+        mmap: bool = False,
+        encoding: str = None,
+        parse_in_executor: bool = False,
+        executor: concurrent.futures.Executor = None,
+    ) -> AsyncIterator[Tuple[Union[str, Path], Union[Data, ParseError]]]:
+        """Parses the contents of many files concurrently.
+
+        At most `limit` files are read at the same time, the event loop stays
+        responsive while the files are processed.
+
+        Parameters
+        ----------
+        files : Iterable[str or pathlib.Path]
+            The paths of the files to parse.
+        limit : int, optional
+            The maximal number of files processed concurrently, by default 64.
+        ordered : bool, optional
+            If True (default), the results are yielded in the order of the files.
+            Otherwise, the results are yielded as soon as a file is parsed.
+        on_error : {"raise", "skip", "collect"}, optional
+            How to handle files that can not be read or parsed. If "raise"
+            (default), a ``ParseError`` is raised. If "skip", the file is
+            skipped. If "collect", the ``ParseError`` is yielded instead of the
+            parsed data.
+        mmap : bool, optional
+            If True, the files are memory-mapped, see ``Template.parse_file``.
+        encoding : str, optional
+            The encoding of the files, see ``Template.parse_file``.
+        parse_in_executor : bool, optional
+            If True, the files are also parsed in the executor.
+        executor : concurrent.futures.Executor, optional
+            The executor used for reading the files, by default the default
+            executor of the event loop.
+
+        Yields
+        ------
+        file : str or pathlib.Path
+            The path of the file as given.
+        data : dict[str|int, Any] or ParseError
+            The parsed data of the file as a dictionary.
+
+        Examples
+        --------
+        >>> template = Template("N={n:d} E={energy:f}")
+        >>> files = [f"run{i}/output.txt" for i in range(1000)]
+        >>> async for file, data in template.aparse_files(files, limit=32):
+        ...     print(file, data["energy"])
+        """
+        if on_error not in ON_ERROR:
+            raise ValueError(f"Invalid value {on_error} of on_error: use {ON_ERROR}")
+        files = list(files)
+        semaphore = asyncio.Semaphore(limit)
+        kwargs = dict(
+            mmap=mmap,
+            encoding=encoding,
+            parse_in_executor=parse_in_executor,
+            executor=executor,
+        )
+
+        async def parse(index: int, file: Union[str, Path]):
+            async with semaphore:
+                try:
+                    data = await self.aparse_file(file, **kwargs)
+                except Exception as e:
+                    data = ParseError(f"File {file}: {e}", index)
+                    data.__cause__ = e
+            return index, data
+
+        tasks = [asyncio.ensure_future(parse(i, f)) for i, f in enumerate(files)]
+        try:
+            results = tasks if ordered else asyncio.as_completed(tasks)
+            for result in results:
+                index, data = await result
+                if isinstance(data, ParseError):
+                    if on_error == "skip":
+                        continue
+                    if on_error == "raise":
+                        raise data
+                yield files[index], data
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+class TemplateSet:
+    """Set of templates that are matched against a text in a single pass.
+
+    The RegEx patterns of the templates are combined into a single alternation,
+    so a text is matched against all templates at once instead of trying each
+    template in turn. The templates are tried in the given order and the first
+    template matching the whole text is used.
+
+    Parameters
+    ----------
+    templates : Iterable[Template or str] or Mapping[Any, Template or str]
+        The templates. If a mapping is given, the keys are used as template ids,
+        otherwise the index of the template. Template strings are compiled with
+        the `ignore_case` and `flags` options.
+    ignore_case : bool, optional
+        Ignore case when matching fields of template strings, by default False.
+    flags : int or re.RegexFlag, optional
+        Additional RegEx flags of template strings.
+
+    Examples
+    --------
+    >>> templates = TemplateSet({
+    ...     "iteration": "Iteration {it:d}: E={energy:f}",
+    ...     "converged": "Converged after {n:d} iterations",
+    ... })
+    >>> templates.parse("Converged after 12 iterations")
+    ('converged', {'n': 12})
+    """
+
+    def __init__(
+        self,
+        templates: Union[Iterable[Union[Template, str]], Mapping[Any, Template]],
+        ignore_case: bool = False,
+        flags: Union[int, re.RegexFlag] = None,
+    ):
+        if not isinstance(templates, Mapping):
+            templates = dict(enumerate(templates))
+        if not templates:
+            raise ValueError("A template set needs at least one template")
+        self.templates = dict()
+        for key, template in templates.items():
+            if not isinstance(template, Template):
+                template = Template(template, ignore_case=ignore_case, flags=flags)
+            self.templates[key] = template
+        kinds = {template.binary for template in self.templates.values()}
+        if len(kinds) > 1:
+            raise ValueError("Can't combine str and bytes templates")
+        self.binary = kinds.pop()
+
+        # Combine the patterns, the outer group of each alternative identifies the
+        # template and is followed by the groups of the fields of the template
+        alternatives = list()
+        self._dispatch = dict()
+        self._scores = dict()
+        index = 1
+        for key, template in self.templates.items():
+            source, letters = _unnamed_pattern(template._pattern)
+            if letters:
+                source = f"(?{letters}:{source})"
+            alternatives.append(f"({source})")
+            # Specificity of the template: the length of the literal text
+            items = _split_template(template._text_template)
+            self._scores[key] = sum(len(item[0]) for item in items)
+            num_groups = template._pattern.groups
+            self._dispatch[index] = (key, template, index, index + num_groups)
+            index += num_groups + 1
+        source = "|".join(alternatives)
+        if self.binary:
+            self._pattern = re.compile(source.encode("latin-1"))
+        else:
+            self._pattern = re.compile(source)
+        self._strip = _strip_bytes if self.binary else str.strip
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.templates)
+
+    def __getitem__(self, key: Any) -> Template:
+        return self.templates[key]
+
+    def parse(self, text: str, best: bool = False) -> Tuple[Any, Data]:
+        """Parses text with the first (or best) matching template of the set.
+
+        Parameters
+        ----------
+        text : str
+            The text to parse.
+        best : bool, optional
+            If True, the text is matched against all templates and the most
+            specific matching template, i.e. the one with the most literal text,
+            is used. Ties are resolved by the order of the templates. By default
+            the first matching template is used, which only takes a single match.
+
+        Returns
+        -------
+        key : Any
+            The id of the matching template.
+        data : dict[str|int, Any]
+            The parsed data as a dictionary.
+        """
+        text = self._strip(text)
+        match = self._pattern.fullmatch(text)
+        if match is None:
+            raise ParseError("Text does not match any template")
+        key, template, start, end = self._dispatch[match.lastindex]
+        if not best:
+            return key, template._convert(match.groups()[start:end])
+
+        # Check the remaining templates for a more specific match
+        keys = list(self.templates)
+        best_key = key
+        for other in keys[keys.index(key) + 1 :]:
+            if self._scores[other] <= self._scores[best_key]:
+                continue
+            if self.templates[other]._pattern.fullmatch(text) is not None:
+                best_key = other
+        if best_key == key:
+            return key, template._convert(match.groups()[start:end])
+        template = self.templates[best_key]
+        return best_key, template._convert(template._pattern.fullmatch(text).groups())
+
+    def parse_many(
+        self, texts: Iterable[str], *, on_error: str = "raise"
+    ) -> Iterator[Tuple[Any, Union[Data, ParseError]]]:
+        """Parses many texts with the first matching template of the set.
+
+        Parameters
+        ----------
+        texts : Iterable[str]
+            The texts to parse.
+        on_error : {"raise", "skip", "collect"}, optional
+            How to handle texts that don't match any template, see
+            ``Template.parse_many``. If "collect", the id is None.
+
+        Yields
+        ------
+        key : Any
+            The id of the matching template.
+        data : dict[str|int, Any] or ParseError
+            The parsed data as a dictionary.
+        """
+        if on_error not in ON_ERROR:
+            raise ValueError(f"Invalid value {on_error} of on_error: use {ON_ERROR}")
+        fullmatch, strip = self._pattern.fullmatch, self._strip
+        dispatch = self._dispatch
+        for index, text in enumerate(texts):
+            try:
+                match = fullmatch(strip(text))
+                if match is None:
+                    raise ParseError("Text does not match any template")
+                key, template, start, end = dispatch[match.lastindex]
+                result = key, template._convert(match.groups()[start:end])
+            except Exception as e:
+                if on_error == "skip":
+                    continue
+                error = ParseError(f"Text {index}: {e}", index, text)
+                if on_error == "raise":
+                    raise error from e
+                error.__cause__ = e
+                result = None, error
+            yield result
+
+
+# Template of the worker processes of ``Template.parse_files``
+_worker_template: Optional[Tuple[Template, bool, Optional[str]]] = None
+
+
+def _init_worker(template: Template, mmap: bool, encoding: Optional[str]) -> None:
+    """Stores the template in a worker process of ``Template.parse_files``."""
+    global _worker_template
+    _worker_template = template, mmap, encoding
+
+
+def _parse_chunk_worker(
+    chunk: List[Tuple[int, Union[str, Path]]],
+) -> List[Tuple[int, Union[Data, ParseError]]]:
+    """Parses a chunk of files with the template of the worker process."""
+    template, mmap, encoding = _worker_template
+    return _parse_chunk(template, chunk, mmap, encoding)
+
+
+def _parse_chunk(
+    template: Template,
+    chunk: List[Tuple[int, Union[str, Path]]],
+    mmap: bool = False,
+    encoding: str = None,
+) -> List[Tuple[int, Union[Data, ParseError]]]:
+    """Parses a chunk of files and returns the data or error of each file.
+
+    Parameters
+    ----------
+    template : Template
+        The template used for parsing the files.
+    chunk : list[tuple[int, str or pathlib.Path]]
+        The indices and paths of the files.
+    mmap : bool, optional
+        If True, the files are memory-mapped.
+    encoding : str, optional
+        The encoding of the files.
+
+    Returns
+    -------
+    results : list[tuple[int, dict or ParseError]]
+        The index and parsed data of each file. If a file can't be read or
+        parsed, a ``ParseError`` is returned instead of the data.
+    """
+    results = list()
+    for index, file in chunk:
+        try:
+            data = template.parse_file(file, mmap=mmap, encoding=encoding)
+        except Exception as e:
+            data = ParseError(f"File {file}: {e}", index)
+            data.__cause__ = e
+        results.append((index, data))
+    return results
+
+
+def _file_results(
+    files: List[Union[str, Path]],
+    results: Iterable[List[Tuple[int, Union[Data, ParseError]]]],
+    on_error: str,
+) -> Iterator[Tuple[Union[str, Path], Union[Data, ParseError]]]:
+    """Yields the file and parsed data of the chunk results of ``parse_files``."""
+    for chunk in results:
+        for index, data in chunk:
+            if isinstance(data, ParseError):
+                if on_error == "skip":
+                    continue
+                if on_error == "raise":
+                    raise data
+            yield files[index], data
+
+
+class _TemplateCache:
+    """Bounded LRU cache of compiled templates used by the module-level functions.
+
+    Templates are keyed by the template string, the matching options and the
+    identity of the custom handlers, so the same handler instances always map to
+    the same compiled template.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximal number of cached templates, by default 128. A size of 0 disables
+        the cache.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        template: str,
+        handlers: Tuple[CustomFormatter, ...] = (),
+        ignore_case: bool = False,
+        flags: Union[int, re.RegexFlag] = None,
+    ) -> "Template":
+        """Returns a cached template or compiles and caches a new one."""
+        key = (template, ignore_case, int(flags or 0), tuple(id(h) for h in handlers))
+        with self._lock:
+            tmplt = self._templates.get(key)
+            if tmplt is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return tmplt
+            self.misses += 1
+
+        tmplt = Template(template, *handlers, ignore_case=ignore_case, flags=flags)
+        with self._lock:
+            if self.maxsize > 0:
+                self._templates[key] = tmplt
+                self._trim()
+        return tmplt
+
+    def _trim(self) -> None:
+        while len(self._templates) > self.maxsize:
+            self._templates.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        """Sets the maximal number of cached templates."""
+        if maxsize < 0:
+            raise ValueError(f"Cache size must be non-negative, not {maxsize}")
+        with self._lock:
+            self.maxsize = maxsize
+            self._trim()
+
+    def clear(self) -> None:
+        """Removes all cached templates and resets the statistics."""
+        with self._lock:
+            self._templates.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Returns the cache statistics."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._templates))
+
+
+_cache = _TemplateCache()
+
+
+def clear_cache() -> None:
+    """Clears the template cache of the module-level functions.
+
+    See Also
+    --------
+    cache_info: Statistics of the template cache.
+    """
+    _cache.clear()
+
+
+def cache_info() -> CacheInfo:
+    """Returns statistics of the template cache of the module-level functions.
+
+    Returns
+    -------
+    info : CacheInfo
+        Named tuple with the number of cache ``hits`` and ``misses``, the
+        ``maxsize`` of the cache and the current number of cached templates
+        ``currsize``.
+
+    Examples
+    --------
+    >>> clear_cache()
+    >>> parse("Hello {name}", "Hello John")
+    {'name': 'John'}
+    >>> parse("Hello {name}", "Hello Jane")
+    {'name': 'Jane'}
+    >>> cache_info()
+    CacheInfo(hits=1, misses=1, maxsize=128, currsize=1)
+    """
+    return _cache.info()
+
+
+def set_cache_size(maxsize: int) -> None:
+    """Sets the maximal number of templates cached by the module-level functions.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximal number of cached templates. The least recently used templates are
+        dropped if the cache exceeds the new size. A size of 0 disables the cache.
+    """
+    _cache.resize(maxsize)
 
 
 def parse(
@@ -750,7 +3628,7 @@ def parse(
     --------
     Template.parse: Parse text using the `Template` instance.
     """
-    return Template(template, *handlers, ignore_case=ignore_case).parse(text)
+    return _cache.get(template, handlers, ignore_case).parse(text)
 
 
 def search(
@@ -786,7 +3664,7 @@ def search(
     --------
     Template.search: Search text for item using the `Template` instance.
     """
-    return Template(template, *handlers, ignore_case=ignore_case).search(text, item)
+    return _cache.get(template, handlers, ignore_case).search(text, item)
 
 
 # noinspection PyShadowingBuiltins
@@ -811,7 +3689,7 @@ def format(template: str, data: Data, *handlers: CustomFormatter) -> str:
     --------
     Template.format: Format string using the `Template` instance.
     """
-    return Template(template, *handlers).format(data)
+    return _cache.get(template, handlers).format(data)
 
 
 def parse_file(
@@ -842,7 +3720,7 @@ def parse_file(
     --------
     Template.parse_file: Parse file using the `Template` instance.
     """
-    return Template(template, *handlers, ignore_case=ignore_case).parse_file(file)
+    return _cache.get(template, handlers, ignore_case).parse_file(file)
 
 
 def search_file(
@@ -878,9 +3756,7 @@ def search_file(
     --------
     Template.search_file: Search text for item using the `Template` instance
     """
-    return Template(template, *handlers, ignore_case=ignore_case).search_file(
-        file, item
-    )
+    return _cache.get(template, handlers, ignore_case).search_file(file, item)
 
 
 # noinspection PyShadowingBuiltins
@@ -904,4 +3780,4 @@ def format_file(
     --------
     Template.format_file: Format file using the `Template` instance.
     """
-    Template(template, *handlers).format_file(file, data)
+    _cache.get(template, handlers).format_file(file, data)
@@ -2,10 +2,13 @@
 # Author: Dylan Jones
 # Date:   2023-11-05
 
+import asyncio
+import pickle
+from array import array
 from datetime import datetime
 from textwrap import dedent
 
-from pytest import mark
+from pytest import importorskip, mark, raises
 from pytz import timezone
 
 import ftmplt
@@ -274,6 +277,37 @@ def test_parse_datetime(fmt):
     assert parsed[0] == actual
 
 
+@mark.parametrize(
+    "fmt, value",
+    [
+        ("%Y-%m-%d %H:%M:%S", "2024-01-05 12:03:04"),
+        ("%Y-%m-%dT%H:%M:%S.%f", "2024-01-05T12:03:04.5"),
+        ("%d/%m/%Y %H:%M", "05/01/2024 12:03"),
+        ("%H:%M:%S.%f", "12:03:04.000001"),
+        ("%Y%m%d", "20240105"),
+        ("%m%%%d", "01%05"),
+        # Not zero-padded, parsed by strptime
+        ("%Y-%m-%d %H:%M:%S", "2024-1-5 1:2:3"),
+        ("%Y-%m-%d", "2024-01-05 "),
+        ("%Y-%m-%d", "2024-02-30"),
+        ("%Y-%m-%d %H:%M:%S", "2024-01-05 24:00:00"),
+        ("%Y-%m-%dT%H:%M:%S.%f", "2024-01-05T12:03:04.1234567"),
+        ("%Y-%m-%dT%H", "2024-01-05t12"),
+    ],
+)
+def test_datetime_parser(fmt, value):
+    parse = ftmplt._datetime_parser(fmt)
+    try:
+        expected = datetime.strptime(value, fmt)
+    except ValueError as e:
+        with raises(ValueError) as excinfo:
+            parse(value)
+        assert str(excinfo.value) == str(e)
+    else:
+        assert parse(value) == expected
+        assert parse(value.encode()) == expected
+
+
 def test_custom_formatter():
     class ArrayFormatter(ftmplt.CustomFormatter):
         def parse(self, text: str):
@@ -417,3 +451,887 @@ def test_multiline_field_end():
     parsed = ftmplt.parse(tmplt, text)
     s = "This is a text\nthat spans multiple lines\nat the end of the string"
     assert parsed[0] == s
+
+
+def test_template_cache():
+    ftmplt.clear_cache()
+    tmplt = "Beginning {a:d} and {b} end"
+    assert ftmplt.parse(tmplt, "Beginning 1 and x end") == {"a": 1, "b": "x"}
+    assert ftmplt.parse(tmplt, "Beginning 2 and y end") == {"a": 2, "b": "y"}
+    assert ftmplt.format(tmplt, {"a": 3, "b": "z"}) == "Beginning 3 and z end"
+    info = ftmplt.cache_info()
+    assert info.hits == 2
+    assert info.misses == 1
+    assert info.currsize == 1
+
+    # Different options result in a different template
+    ftmplt.parse(tmplt, "BEGINNING 1 AND x END", ignore_case=True)
+    assert ftmplt.cache_info().currsize == 2
+
+    ftmplt.clear_cache()
+    assert ftmplt.cache_info() == (0, 0, info.maxsize, 0)
+
+
+def test_template_cache_size():
+    ftmplt.clear_cache()
+    try:
+        ftmplt.set_cache_size(2)
+        for i in range(4):
+            ftmplt.parse("Value %d: {x:d}" % i, "Value %d: 42" % i)
+        assert ftmplt.cache_info().currsize == 2
+
+        ftmplt.set_cache_size(0)
+        assert ftmplt.cache_info().currsize == 0
+        ftmplt.parse("Value: {x:d}", "Value: 42")
+        assert ftmplt.cache_info().currsize == 0
+    finally:
+        ftmplt.set_cache_size(128)
+        ftmplt.clear_cache()
+
+
+def test_template_cache_handlers():
+    class UpperFormatter(ftmplt.CustomFormatter):
+        def parse(self, text: str):
+            return text.upper()
+
+        def format(self, value) -> str:
+            return value.lower()
+
+    ftmplt.clear_cache()
+    tmplt = "Beginning {b} end"
+    assert ftmplt.parse(tmplt, "Beginning x end") == {"b": "x"}
+    assert ftmplt.parse(tmplt, "Beginning x end", UpperFormatter("b")) == {"b": "X"}
+    assert ftmplt.cache_info().misses == 2
+
+
+def test_field_pattern_typed():
+    # Typed fields only match valid values, so adjacent fields can be split
+    parsed = ftmplt.parse("Value {x:d}{unit}", "Value 42kg")
+    assert parsed == {"x": 42, "unit": "kg"}
+    parsed = ftmplt.parse("Value {x:.2e}{unit}", "Value -1.50e+03kg")
+    assert parsed == {"x": -1500.0, "unit": "kg"}
+    template = ftmplt.Template("Value {x:d} end")
+    assert template._pattern.match("Value abc end") is None
+    assert template._pattern.match("Value 12 end") is not None
+
+
+@mark.parametrize(
+    "text,value",
+    [
+        (".123E+01", 1.23),
+        ("1.5D+02", 150.0),
+        ("-2.0d-1", -0.2),
+        ("inf", float("inf")),
+    ],
+)
+def test_parse_float_fortran(text, value):
+    parsed = ftmplt.parse("Beginning {x:e} end", f"Beginning {text} end")
+    assert parsed["x"] == value
+
+
+def test_field_pattern_width():
+    fstr = "Beginning {a:<6}{b} end"
+    s = fstr.format(a="ab", b="cd")
+    assert s == "Beginning ab    cd end"
+    parsed = ftmplt.parse(fstr, s)
+    assert parsed == {"a": "ab", "b": "cd"}
+
+
+@mark.parametrize(
+    "fstr,text",
+    [
+        ("Beginning {} end", "Beginning text end"),
+        ("Beginning {a} {b:d} {c:f} end", "Beginning text 1 1.100000 end"),
+        ("Beginning {0} {1:d} {c:f} end", "Beginning text 1 1.100000 end"),
+        ("Beginning {a:d} {b:d} {a:d} end", "Beginning 1 2 1 end"),
+        ("{a}{b} {c}", "x y z"),
+        ("Beginning\n{}\nend", "Beginning\nmulti\nline\nend"),
+        ("{}\nend", "multi\nline\nend"),
+        ("Beginning\n{}", "Beginning\nmulti\nline"),
+        ("hello", " hello "),
+        ("{{a}} and {{b}}", "{a} and {b}"),
+        ("{{a}} and {b}", "{a} and x"),
+    ],
+)
+def test_scan_engine(fstr, text):
+    expected = ftmplt.Template(fstr, engine="regex").parse(text)
+    template = ftmplt.Template(fstr, engine="scan")
+    assert template.parse(text) == expected
+    for key in expected:
+        expected_result = ftmplt.Template(fstr, engine="regex").search(text, key)
+        assert template.search(text, key) == expected_result
+
+
+def test_parse_no_fields():
+    assert ftmplt.Template("hello").parse("hello") == {}
+    assert ftmplt.Template(b"hello").parse(b"hello") == {}
+    assert ftmplt.Template("{{a}} {b}").parse("{a} x") == {"b": "x"}
+    for engine in ("regex", "scan"):
+        with raises(ValueError):
+            ftmplt.Template("hello", engine=engine).parse("hello world")
+
+
+def test_scan_engine_ignore_case():
+    template = ftmplt.Template(
+        "Beginning {a} and {b:d} END", ignore_case=True, engine="regex"
+    )
+    expected = template.parse("BEGINNING x AND 1 end")
+    template = ftmplt.Template(
+        "Beginning {a} and {b:d} END", ignore_case=True, engine="scan"
+    )
+    assert template.parse("BEGINNING x AND 1 end") == expected
+    assert template.search("BEGINNING x AND 1 end", "a") == ("x", (10, 11))
+
+
+def test_scan_engine_no_match():
+    template = ftmplt.Template("{a}{b} {c}:{d}.", engine="scan")
+    text = "x" * 100_000
+    with raises(ValueError):
+        template.parse(text)
+    with raises(ValueError):
+        ftmplt.Template("Beginning {a:d} end", engine="scan").parse("Beginning x end")
+    with raises(ValueError):
+        ftmplt.Template("Beginning {a:d} end").parse("Beginning x end")
+
+
+def test_scan_engine_timeout():
+    # The RegEx engine can't be interrupted
+    with raises(ValueError):
+        ftmplt.Template("{a} {b:d}", timeout=0.0)
+    with raises(ValueError):
+        ftmplt.Template("{a} {b}", engine="regex", timeout=1.0)
+    template = ftmplt.Template("{a} {b} {c}", engine="scan", timeout=0)
+    with raises(TimeoutError):
+        template.parse("x y z")
+    template = ftmplt.Template("{a} {b} {c}", engine="scan", timeout=10)
+    assert template.parse("x y z") == {"a": "x", "b": "y", "c": "z"}
+
+
+@mark.parametrize(
+    "fstr,engine",
+    [
+        ("Beginning {a} and {b} end", "scan"),
+        ("Beginning {} and {} end", "scan"),
+        ("Beginning {a} and {b:d} end", "regex"),
+        ("Beginning {a:<10} and {b} end", "regex"),
+        ("Beginning {a} and {a} end", "regex"),
+    ],
+)
+def test_auto_engine(fstr, engine):
+    assert ftmplt.Template(fstr).engine == engine
+    assert ftmplt.Template(fstr, ignore_case=True).engine == "regex"
+
+
+def test_scan_engine_identical():
+    import random
+
+    rng = random.Random(0)
+    templates = ["{a}ab{b}a{c}", "a{a}{b}ba{c}b", "{a}a{b}aa{c}", "ab{a}b{b}"]
+    for fstr in templates:
+        regex = ftmplt.Template(fstr, engine="regex")
+        scan = ftmplt.Template(fstr, engine="auto")
+        assert scan.engine == "scan"
+        for _ in range(500):
+            text = "".join(rng.choice("ab ") for _ in range(rng.randint(0, 12)))
+            try:
+                expected = regex.parse(text)
+            except ValueError:
+                with raises(ValueError):
+                    scan.parse(text)
+                continue
+            assert scan.parse(text) == expected
+
+
+def test_add_handler_updates_plan():
+    class ListFormatter(ftmplt.CustomFormatter):
+        def parse(self, text: str):
+            return text.split()
+
+        def format(self, value) -> str:
+            return " ".join(value)
+
+    template = ftmplt.Template("Beginning {} and {} end")
+    text = "Beginning a b and c d end"
+    assert template.parse(text) == {0: "a b", 1: "c d"}
+    template.add_handler(ListFormatter(1))
+    assert template.parse(text) == {0: "a b", 1: ["c", "d"]}
+    assert template.search(text, 1) == (["c", "d"], (18, 21))
+
+
+@mark.parametrize("engine", ["regex", "scan"])
+def test_parse_many(engine):
+    template = ftmplt.Template("Beginning {a} and {b:d} end", engine=engine)
+    texts = ["Beginning x and 1 end", "Beginning y and z end", "Beginning z and 3 end"]
+    expected = [{"a": "x", "b": 1}, {"a": "z", "b": 3}]
+    assert list(template.parse_many(texts, on_error="skip")) == expected
+
+    results = list(template.parse_many(texts, on_error="collect"))
+    assert results[0] == expected[0]
+    assert results[2] == expected[1]
+    assert isinstance(results[1], ftmplt.ParseError)
+    assert results[1].index == 1
+    assert results[1].text == texts[1]
+
+    results = template.parse_many(texts)
+    assert next(results) == expected[0]
+    with raises(ftmplt.ParseError):
+        next(results)
+    with raises(ValueError):
+        list(template.parse_many(texts, on_error="ignore"))
+
+
+def test_parse_columns():
+    template = ftmplt.Template("Run {name}: n={n:d} x={x:.2f} big={big:d}")
+    texts = [
+        template.format(name="a", n=1, x=0.5, big=1),
+        "invalid",
+        template.format(name="b", n=-2, x=1.25, big=2**70),
+    ]
+    columns = template.parse_columns(texts, on_error="skip", as_numpy=False)
+    assert columns["name"] == ["a", "b"]
+    assert columns["n"] == array("q", [1, -2])
+    assert columns["x"] == array("d", [0.5, 1.25])
+    # Integers exceeding 64 bit are stored in a list
+    assert columns["big"] == [1, 2**70]
+
+    with raises(ftmplt.ParseError):
+        template.parse_columns(texts, as_numpy=False)
+
+
+def test_parse_columns_numpy():
+    np = importorskip("numpy")
+    template = ftmplt.Template("Run {name}: n={n:d} x={x:.2f}")
+    texts = [template.format(name="a", n=1, x=0.5), "Run b: n=2 x=1.25"]
+    columns = template.parse_columns(texts, as_numpy=True)
+    assert columns["name"] == ["a", "b"]
+    assert np.array_equal(columns["n"], np.array([1, 2], dtype=np.int64))
+    assert np.array_equal(columns["x"], np.array([0.5, 1.25]))
+
+
+@mark.parametrize("as_numpy", [False, None])
+def test_parse_columns_conversion(as_numpy):
+    template = ftmplt.Template("x={x:e} p={p:.1%} n={n:x}")
+    texts = ["x=1.5D+02 p=12.5% n=ff", "x=1__0 p=1.0% n=1", "x=2.0 p=50.0% n=0x10"]
+    columns = template.parse_columns(
+        texts, on_error="skip", as_numpy=as_numpy, chunk_size=2
+    )
+    assert list(columns["x"]) == [150.0, 2.0]
+    assert list(columns["p"]) == [0.125, 0.5]
+    assert list(columns["n"]) == [255, 16]
+
+    with raises(ftmplt.ParseError) as info:
+        template.parse_columns(texts, as_numpy=as_numpy)
+    assert info.value.index == 1
+
+
+def test_finditer():
+    template = ftmplt.Template(
+        dedent(
+            """\
+            Iteration {it:d}
+              E = {energy:.6e}
+              status: {status}
+            End of iteration
+            """
+        )
+    )
+    status = ["ok", "failed", "ok"]
+    blocks = [
+        template.format(it=i, energy=-1.5 * i, status=status[i - 1])
+        for i in range(1, 4)
+    ]
+    text = "Header\n" + "".join(blocks) + "Footer"
+    results = list(template.finditer(text))
+    assert len(results) == 3
+    for i, (data, span) in enumerate(results, start=1):
+        assert data == {"it": i, "energy": -1.5 * i, "status": status[i - 1]}
+        assert text[span[0] : span[1]] == blocks[i - 1].strip()
+
+    assert template.findall(text) == [data for data, _ in results]
+    assert template.findall("no match") == []
+
+
+def test_finditer_trailing_datetime():
+    template = ftmplt.Template("t: {ts:%H:%M}")
+    text = "t: 10:00\nt: 11:30 and t: 1:05"
+    assert template.parse("t: 10:00") == {"ts": datetime(1900, 1, 1, 10, 0)}
+    results = list(template.finditer(text))
+    assert results == [
+        ({"ts": datetime(1900, 1, 1, 10, 0)}, (0, 8)),
+        ({"ts": datetime(1900, 1, 1, 11, 30)}, (9, 17)),
+    ]
+    template = ftmplt.Template(b"{ts:%Y-%m-%d}")
+    assert template.findall(b"2020-01-02 2021-03-04") == [
+        {"ts": datetime(2020, 1, 2)},
+        {"ts": datetime(2021, 3, 4)},
+    ]
+    # Only numeric directives have a pattern of the value
+    template = ftmplt.Template("t: {ts:%b %d}")
+    assert template.parse("t: Jan 02") == {"ts": datetime(1900, 1, 2)}
+    with raises(ValueError):
+        template.findall("t: Jan 02")
+
+
+@mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_iter_file(tmp_path, chunk_size):
+    template = ftmplt.Template("Iteration {it:d}: E={energy:.3f} ({status})")
+    lines = ["Header", "garbage Iteration x"]
+    for i in range(20):
+        lines.append(template.format(it=i, energy=-0.5 * i, status="ok"))
+        lines.append("Some log output")
+    text = "\n".join(lines)
+    file = tmp_path / "output.log"
+    file.write_text(text)
+
+    expected = list(template.finditer(text))
+    results = list(template.iter_file(file, chunk_size=chunk_size))
+    assert len(results) == 20
+    assert results == expected
+
+
+def test_iter_file_leading_field(tmp_path):
+    template = ftmplt.Template("{n:d} items for {name};")
+    text = "3 items for a;\n" + "no match here\n" * 20000 + "5 items for b;\n"
+    file = tmp_path / "output.log"
+    file.write_text(text)
+
+    expected = list(template.finditer(text))
+    assert len(expected) == 2
+    assert list(template.iter_file(file, chunk_size=1024)) == expected
+    # The occurrence doesn't fit into the carried text
+    results = list(template.iter_file(file, chunk_size=4, max_length=8))
+    assert [data for data, _ in results] == []
+
+    # The untyped first field absorbs the text before an occurrence
+    template = ftmplt.Template("{key} = {value:d};")
+    text = "a = 1;" + "no match here = x;\n" * 20000 + "b = 2;"
+    file.write_text(text)
+    expected = list(template.finditer(text))
+    results = list(template.iter_file(file, chunk_size=1024, max_length=100))
+    assert results[0] == expected[0]
+    data, (start, end) = results[-1]
+    assert data["key"].endswith("\nb") and data["value"] == 2
+    assert end == len(text) and end - start <= 100
+
+
+@mark.parametrize(
+    "tmplt, text",
+    [
+        ("E={x:e}", "E=1.5e+05\nE=2.25E-3 and E=3\nE=-4.125e+12"),
+        ("v={x:#x}", "v=0x1f v=0x2 and v=0x123abc\nv=0xff"),
+        ("t: {x:%H:%M}", "t: 10:00\nt: 11:30 x t: 12:45\nt: 23:59"),
+    ],
+)
+def test_iter_file_trailing_field(tmp_path, tmplt, text):
+    # A number at the end of a chunk might continue in the next chunk
+    template = ftmplt.Template(tmplt)
+    file = tmp_path / "output.log"
+    file.write_text(text)
+
+    expected = list(template.finditer(text))
+    assert len(expected) == 4
+    for chunk_size in range(1, len(text) + 1):
+        assert list(template.iter_file(file, chunk_size=chunk_size)) == expected
+
+
+def test_file_mmap(tmp_path):
+    template = ftmplt.Template("Grüße von {name}: N={n:d} E={e:.3f} {text}")
+    text = "  " + template.format(name="Jürgen", n=42, e=-1.5, text="Ende") + "\n"
+    file = tmp_path / "data.txt"
+    file.write_text(text, encoding="utf-8")
+
+    expected = template.parse(text)
+    assert template.parse_file(file, mmap=True) == expected
+    assert template.parse_file(file, encoding="utf-8") == expected
+
+    value, span = template.search_file(file, "e", mmap=True)
+    assert value == -1.5
+    raw = text.encode("utf-8")
+    assert raw[span[0] : span[1]] == b"-1.500"
+
+    value, span = template.search_file(file, "name", mmap=True, char_offsets=True)
+    assert value == "Jürgen"
+    assert text[span[0] : span[1]] == "Jürgen"
+
+
+def test_file_mmap_errors(tmp_path):
+    template = ftmplt.Template("N={n:d}")
+    file = tmp_path / "data.txt"
+    file.write_text("M=1")
+    with raises(ftmplt.ParseError):
+        template.parse_file(file, mmap=True)
+    with raises(ValueError):
+        template.search_file(file, "n", mmap=True)
+    file.write_text("")
+    with raises(ftmplt.ParseError):
+        template.parse_file(file, mmap=True)
+
+
+def test_bytes_template():
+    template = ftmplt.Template(b"N={n:d} E={e:.3f} p={p:.1%} id={id:x} name={name}!")
+    assert template.binary
+    assert template.engine == "regex"
+    text = template.format(n=3, e=-1.5, p=0.25, id=255, name=b"abc")
+    assert text == b"N=3 E=-1.500 p=25.0% id=ff name=abc!"
+
+    expected = {"n": 3, "e": -1.5, "p": 0.25, "id": 255, "name": b"abc"}
+    assert template.parse(text) == expected
+    assert template.parse(bytearray(b"  " + text + b"\n")) == expected
+    assert template.parse(memoryview(b"  " + text + b"\n")) == expected
+    assert template.search(memoryview(text), "name") == (b"abc", (32, 35))
+    assert template.findall(text + b"\n" + text) == [expected, expected]
+    assert list(template.parse_many([text, memoryview(text)])) == [expected] * 2
+    assert ftmplt.parse(b"x={x:d}", b"x=5") == {"x": 5}
+
+    with raises(ftmplt.ParseError):
+        template.parse(b"N=x")
+    with raises(ValueError):
+        ftmplt.Template(b"{a}", engine="scan")
+
+
+def test_bytes_template_file(tmp_path):
+    template = ftmplt.Template(b"value={v:.2f} name={name}\n")
+    file = tmp_path / "data.bin"
+    template.format_file(file, v=1.25, name=b"\xff\x00")
+    assert file.read_bytes() == b"value=1.25 name=\xff\x00\n"
+
+    expected = {"v": 1.25, "name": b"\xff\x00"}
+    assert template.parse_file(file) == expected
+    assert template.parse_file(file, mmap=True) == expected
+    assert template.search_file(file, "v", mmap=True) == (1.25, (6, 10))
+    results = list(template.iter_file(file, chunk_size=4))
+    assert results == list(template.finditer(file.read_bytes()))
+
+
+@mark.parametrize(
+    "tmplt",
+    [
+        "Hello, my name is {name} and I am {age:d} years old.",
+        "  {name!r:>10} {age:05d}  {x:.3e} {{escaped}} }}{{ {p:.1%}\n",
+        "{0} and {1:x} then {name!s:^9}",
+        "{} {:.2f} {}",
+        "{t:%Y-%m-%d %H:%M} {name!a}",
+        "{x:{width}.2f} {width}",
+    ],
+)
+def test_format_plan(tmplt):
+    data = {
+        "name": "Jürgen",
+        "age": 42,
+        "x": 1.5,
+        "p": 0.25,
+        "width": 8,
+        "t": datetime(2020, 1, 2, 3, 4),
+    }
+    args = ("a", 1.5, "c") if "{}" in tmplt else ("a", 255)
+    template = ftmplt.Template(tmplt)
+    expected = tmplt.format(*args, **data)
+    assert template.format(dict(enumerate(args)), **data) == expected
+
+
+def test_format_plan_errors():
+    template = ftmplt.Template("{0} {1} {name}")
+    with raises(IndexError):
+        template.format({0: "a", "name": "b"})
+    with raises(KeyError):
+        template.format({0: "a", 1: "b"})
+    # Unknown conversions only fail when formatting
+    template = ftmplt.Template("{a!x} y")
+    assert template.parse("hi y") == {"a": "hi"}
+    with raises(ValueError):
+        template.format(a="hi")
+
+
+def test_format_many(tmp_path):
+    template = ftmplt.Template("x={x:.2f} y={y:d} {0}")
+    records = [{"x": i / 3, "y": i**2, 0: f"r{i}"} for i in range(50)]
+    texts = list(template.format_many(records))
+    assert texts == [template.format(record) for record in records]
+
+    file = tmp_path / "sweep.txt"
+    assert template.format_to(file, iter(records), buffer_size=64) == 50
+    assert file.read_text() == "\n".join(texts)
+    with open(file, "w") as fh:
+        assert template.format_to(fh, records[:2], separator="\n---\n") == 2
+    assert file.read_text() == texts[0] + "\n---\n" + texts[1]
+
+    template = ftmplt.Template(b"n={n:d};")
+    assert template.format_to(file, [{"n": 1}, {"n": 2}], separator=b"") == 2
+    assert file.read_bytes() == b"n=1;n=2;"
+
+
+@mark.parametrize("executor", ["process", "thread"])
+@mark.parametrize("ordered", [True, False])
+def test_parse_files(tmp_path, executor, ordered):
+    template = ftmplt.Template("Run {name}: N={n:d} E={e:.3f}")
+    files, expected = list(), dict()
+    for i in range(20):
+        file = tmp_path / f"run{i}.txt"
+        file.write_text(template.format(name=f"r{i}", n=i, e=-i / 4))
+        files.append(file)
+        expected[file] = {"name": f"r{i}", "n": i, "e": -i / 4}
+    files.append(tmp_path / "missing.txt")
+    (tmp_path / "invalid.txt").write_text("Run x: N=? E=0")
+    files.append(tmp_path / "invalid.txt")
+
+    kwargs = dict(workers=2, executor=executor, ordered=ordered, chunk_size=3)
+    results = list(template.parse_files(files, on_error="collect", **kwargs))
+    assert len(results) == len(files)
+    if ordered:
+        assert [file for file, _ in results] == files
+    errors = {file: data for file, data in results if file not in expected}
+    assert {file: data for file, data in results if file in expected} == expected
+    assert all(isinstance(error, ftmplt.ParseError) for error in errors.values())
+    assert sorted(error.index for error in errors.values()) == [20, 21]
+
+    results = list(template.parse_files(files, on_error="skip", **kwargs))
+    assert dict(results) == expected
+    with raises(ftmplt.ParseError):
+        list(template.parse_files(files, **kwargs))
+
+
+def test_parse_files_serial(tmp_path):
+    template = ftmplt.Template("N={n:d}")
+    files = list()
+    for i in range(5):
+        files.append(tmp_path / f"{i}.txt")
+        files[-1].write_text(f"N={i}")
+    results = list(template.parse_files(files, workers=1))
+    assert results == [(file, {"n": i}) for i, file in enumerate(files)]
+
+
+class Point:
+    __slots__ = ("x", "y")
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def test_record_type(tmp_path):
+    template = ftmplt.Template("{} x={x:d} y={y:f}", record_type="namedtuple")
+    record = template.parse("a x=1 y=2.5")
+    assert record == ("a", 1, 2.5)
+    assert (record._0, record.x, record.y) == ("a", 1, 2.5)
+    assert pickle.loads(pickle.dumps(record)) == record
+    records = list(template.parse_many(["b x=2 y=0.5", "c"], on_error="skip"))
+    assert records == [("b", 2, 0.5)]
+    assert type(records[0]) is type(record)
+    assert template.findall("a x=1 y=2.5") == [record]
+
+    copy = pickle.loads(pickle.dumps(template))
+    assert copy.record_type == "namedtuple"
+    assert copy.parse("a x=1 y=2.5") == record
+
+    file = tmp_path / "point.txt"
+    file.write_text("p x=3 y=4.0")
+    results = list(template.parse_files([file], workers=1, executor="process"))
+    assert results == [(file, ("p", 3, 4.0))]
+
+    template = ftmplt.Template("x={x:d} y={y:f}", record_type=Point)
+    point = template.parse("x=1 y=2.5")
+    assert isinstance(point, Point)
+    assert (point.x, point.y) == (1, 2.5)
+
+    with raises(ValueError):
+        ftmplt.Template("x={x:d}", record_type="list")
+
+
+class UpperFormatter(ftmplt.CustomFormatter):
+    def parse(self, text):
+        return text.strip().lower()
+
+    def format(self, value):
+        return value.upper()
+
+
+@mark.parametrize(
+    "tmplt, kwargs",
+    [
+        ("Run {name}: N={n:d} E={e:.3f} at {t:%Y-%m-%d}", {}),
+        (
+            "{a} and {b} and {0!r:>5}",
+            {"engine": "scan", "ignore_case": True, "timeout": 2.0},
+        ),
+        (b"N={n:d} data={data}!", {}),
+    ],
+)
+def test_template_serialization(tmplt, kwargs):
+    template = ftmplt.Template(tmplt, UpperFormatter("x"), **kwargs)
+    if isinstance(tmplt, bytes):
+        data = {"n": 1, "data": b"abc"}
+    elif "{a}" in tmplt:
+        data = {"a": "A", "b": "B", 0: "zero"}
+    else:
+        data = {"name": "r1", "n": 3, "e": -0.5, "t": datetime(2020, 1, 2)}
+    text = template.format(data)
+
+    for loaded in (
+        pickle.loads(pickle.dumps(template)),
+        ftmplt.Template.from_bytes(template.to_bytes()),
+    ):
+        assert loaded.template == template.template
+        assert loaded.engine == template.engine
+        assert loaded.timeout == kwargs.get("timeout")
+        assert isinstance(loaded._handlers["x"], UpperFormatter)
+        assert loaded.fields == template.fields
+        assert loaded.format(data) == text
+        assert loaded.parse(text) == template.parse(text)
+
+    with raises(ValueError):
+        ftmplt.Template.from_bytes(pickle.dumps({"version": -1}))
+
+
+def test_template_disk_cache(tmp_path, monkeypatch):
+    tmplt = "Run {name}: N={n:d}"
+    template = ftmplt.Template.from_cache(tmplt, cache_dir=tmp_path)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    def compile_fields(*args, **kwargs):
+        raise AssertionError("Template was compiled")
+
+    monkeypatch.setattr(ftmplt, "_compile_fields", compile_fields)
+    cached = ftmplt.Template.from_cache(
+        tmplt, UpperFormatter("name"), cache_dir=tmp_path
+    )
+    assert cached.fields == template.fields
+    with raises(ValueError):
+        ftmplt.Template.from_cache(tmplt, cache_dir=tmp_path, timeout=1.0)
+    assert cached.parse("Run JOHN: N=3") == {"name": "john", "n": 3}
+    assert cached.format(name="john", n=3) == "Run JOHN: N=3"
+    with raises(AssertionError):
+        ftmplt.Template.from_cache(tmplt, cache_dir=tmp_path, ignore_case=True)
+    # Templates cached by a different version of the code are not loaded
+    monkeypatch.setattr(ftmplt, "_code_hash", lambda: "changed")
+    with raises(AssertionError):
+        ftmplt.Template.from_cache(tmplt, cache_dir=tmp_path)
+
+
+def test_async_files(tmp_path):
+    template = ftmplt.Template("Run {name}: N={n:d}")
+    files = [tmp_path / f"run{i}.txt" for i in range(30)]
+
+    async def write():
+        for i, file in enumerate(files):
+            await template.aformat_file(file, name=f"r{i}", n=i)
+
+    asyncio.run(write())
+    assert files[3].read_text() == "Run r3: N=3"
+    expected = [(file, {"name": f"r{i}", "n": i}) for i, file in enumerate(files)]
+
+    async def parse_all(files, **kwargs):
+        return [item async for item in template.aparse_files(files, **kwargs)]
+
+    assert asyncio.run(template.aparse_file(files[5])) == expected[5][1]
+    assert asyncio.run(parse_all(files, limit=4)) == expected
+    results = asyncio.run(parse_all(files, limit=4, ordered=False, mmap=True))
+    assert sorted(results, key=lambda item: item[1]["n"]) == expected
+
+    invalid = files + [tmp_path / "missing.txt"]
+    assert asyncio.run(parse_all(invalid, on_error="skip")) == expected
+    results = asyncio.run(parse_all(invalid, on_error="collect"))
+    assert isinstance(results[-1][1], ftmplt.ParseError)
+    assert results[-1][1].index == 30
+    with raises(ftmplt.ParseError):
+        asyncio.run(parse_all(invalid, parse_in_executor=True))
+
+
+def test_template_set():
+    templates = ftmplt.TemplateSet(
+        {
+            "iteration": "Iteration {it:d}: E={energy:f}",
+            "converged": "Converged after {n:d} iterations",
+            "message": "{level}: {message}",
+            "error": ftmplt.Template("error: {message}", ignore_case=True),
+        }
+    )
+    assert len(templates) == 4
+    assert templates.parse("Iteration 3: E=-1.5") == (
+        "iteration",
+        {"it": 3, "energy": -1.5},
+    )
+    assert templates.parse(" Converged after 12 iterations\n") == (
+        "converged",
+        {"n": 12},
+    )
+    assert templates.parse("ERROR: disk full") == (
+        "message",
+        {"level": "ERROR", "message": "disk full"},
+    )
+    assert templates.parse("ERROR: disk full", best=True) == (
+        "error",
+        {"message": "disk full"},
+    )
+    with raises(ftmplt.ParseError):
+        templates.parse("Iteration x")
+
+    lines = ["Iteration 1: E=0.5", "garbage", "warning: low memory"]
+    results = list(templates.parse_many(lines, on_error="collect"))
+    assert results[0] == ("iteration", {"it": 1, "energy": 0.5})
+    assert results[1][0] is None and results[1][1].index == 1
+    assert results[2] == ("message", {"level": "warning", "message": "low memory"})
+
+    for line in lines[::2]:
+        key, data = templates.parse(line)
+        assert templates[key].parse(line) == data
+
+
+def test_template_set_bytes():
+    templates = ftmplt.TemplateSet([b"A={a:d}", b"B={b}"])
+    assert templates.parse(b"B=xy") == (1, {"b": b"xy"})
+    assert templates.parse(memoryview(b"A=1")) == (0, {"a": 1})
+    with raises(ValueError):
+        ftmplt.TemplateSet(["A={a:d}", b"B={b}"])
+
+
+@mark.parametrize("engine", ["regex", "scan"])
+def test_parse_lazy(tmp_path, engine):
+    calls = list()
+
+    class CountingFormatter(ftmplt.CustomFormatter):
+        def parse(self, text):
+            calls.append(text)
+            return text.upper()
+
+        def format(self, value):
+            return value.lower()
+
+    template = ftmplt.Template(
+        "{0} and {name} and {1}", CountingFormatter("name"), engine=engine
+    )
+    text = "a and b and c"
+    result = template.parse(text, lazy=True)
+    assert isinstance(result, ftmplt.LazyResult)
+    assert not calls
+    assert result["name"] == "B"
+    assert result["name"] == "B"
+    assert len(calls) == 1
+    assert list(result) == list(template.parse(text)) == [0, "name", 1]
+    assert len(result) == 3
+    assert result == template.parse(text)
+    assert dict(result) == {0: "a", "name": "B", 1: "c"}
+    assert pickle.loads(pickle.dumps(result)) == dict(result)
+    assert "missing" not in result
+    with raises(KeyError):
+        result["missing"]
+
+    template = ftmplt.Template("N={n:d} E={e:f}", engine=engine)
+    results = list(template.parse_many(["N=1 E=2", "N=1_ E=1"], lazy=True))
+    assert results[0] == {"n": 1, "e": 2.0}
+    assert "n" in results[1] and len(results[1]) == 2
+    with raises(ValueError):
+        results[1]["n"]
+    assert results[1]["e"] == 1.0
+    file = tmp_path / "run.txt"
+    file.write_text("N=3 E=0.5\n")
+    for mmap in (False, True):
+        result = template.parse_file(file, mmap=mmap, lazy=True)
+        assert isinstance(result, ftmplt.LazyResult)
+        assert result == {"n": 3, "e": 0.5}
+
+
+STATS = ("prefilter_rejects", "regex_rejects")
+
+
+def test_prefilter():
+    template = ftmplt.Template("Iteration {it:d}: E={energy:f} (dE={de:e})")
+    assert template.engine == "regex"
+    lines = [
+        "Iteration 1: E=-1.5 (dE=1e-3)",
+        "Some log output",
+        "Iteration 2: E=-1.6",
+        "Iteration 3: converged (dE=0)",
+        "Iteration x: E=-1.7 (dE=1e-4)",
+    ]
+    results = list(template.parse_many(lines, on_error="collect"))
+    assert results[0] == {"it": 1, "energy": -1.5, "de": 1e-3}
+    assert all(isinstance(result, ftmplt.ParseError) for result in results[1:])
+    assert template.stats(reset=True) == {"prefilter_rejects": 2, "regex_rejects": 2}
+    assert template.stats() == {"prefilter_rejects": 0, "regex_rejects": 0}
+
+    with raises(ftmplt.ParseError):
+        template.parse("Iteration 2: E=-1.6")
+    assert template.stats()["prefilter_rejects"] == 1
+    # The prefilter is not used if the case is ignored
+    template = ftmplt.Template("Iteration {it:d}", ignore_case=True)
+    assert template.parse("ITERATION 2") == {"it": 2}
+
+
+@mark.parametrize("engine", ["regex", "scan"])
+def test_instrument(tmp_path, engine):
+    template = ftmplt.Template(
+        "Run {name}: N={n:d} E={e:.3f} at {t:%Y-%m-%d}",
+        UpperFormatter("name"),
+        engine=engine,
+    )
+    assert set(template.stats()) == {"prefilter_rejects", "regex_rejects"}
+    events = list()
+    template.instrument(hook=lambda tmplt, event, elapsed: events.append(event))
+
+    file = tmp_path / "run.txt"
+    data = {"name": "x", "n": 1, "e": 2.0, "t": datetime(2024, 1, 5)}
+    template.format_file(file, data)
+    assert template.parse_file(file) == data
+    lines = [file.read_text(), "Run y", file.read_text()]
+    assert len(list(template.parse_many(lines, on_error="skip"))) == 2
+    stats = template.stats(reset=True)
+    assert stats["compile"].calls == 1
+    assert stats["match"].calls == 4
+    for event in ("convert.int", "convert.float", "convert.datetime"):
+        assert stats[event].calls == 3
+        assert stats[event].time >= 0
+    assert stats["handler.parse"].calls == 3
+    assert stats["handler.format"].calls == 1
+    assert stats["io.read"].calls == stats["io.write"].calls == 1
+    assert sorted(set(events)) == sorted(set(stats) - {"compile"} - set(STATS))
+    assert template.stats() == dict.fromkeys(STATS, 0)
+
+    template.instrument(False)
+    assert template.parse_file(file) == data
+    assert template.stats() == dict.fromkeys(STATS, 0)
+    assert "_match" not in vars(template)
+
+
+@mark.parametrize("engine", ["regex", "scan"])
+def test_search_many(engine):
+    template = ftmplt.Template(
+        "Run {name}\nN={n:d} M={m:d}\nE={e:.3f} (dE={de:.1e})\nStatus: {status}\n",
+        engine=engine,
+    )
+    text = "Header\nN=5 M=x\n" + template.format(
+        name="Jürgen", n=3, m=4, e=-1.5, de=0.002, status="ok"
+    )
+    items = ["status", "n", "m", "e", "de", "name"]
+    expected = {item: template.search(text, item) for item in items}
+    assert template.search_many(text, items) == expected
+
+    text = "Run a\nN=1 and more\nStatus: done\n"
+    expected = dict()
+    for item in items:
+        try:
+            expected[item] = template.search(text, item)
+        except ValueError:
+            pass
+    assert 0 < len(expected) < len(items)
+    assert template.search_many(text, items) == expected
+    with raises(KeyError):
+        template.search_many(text, ["missing"])
+
+
+def test_search_file_many(tmp_path):
+    template = ftmplt.Template("Grüße von {name}\nN={n:d} E={e:.3f}\n")
+    text = "Header\n" + template.format(name="Jürgen", n=42, e=-1.5) * 2
+    file = tmp_path / "data.txt"
+    file.write_text(text, encoding="utf-8")
+    items = ["e", "n", "name"]
+    expected = {
+        item: template.search_file(file, item, encoding="utf-8") for item in items
+    }
+    assert template.search_file_many(file, items, encoding="utf-8") == expected
+
+    # The text has no leading whitespace, so the character offsets are the same
+    results = template.search_file_many(file, items, mmap=True, char_offsets=True)
+    assert results == expected
+    results = template.search_file_many(file, items, mmap=True)
+    for item in items:
+        assert results[item] == template.search_file(file, item, mmap=True)